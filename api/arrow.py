@@ -0,0 +1,67 @@
+from fastapi import Request, Response
+from functools import lru_cache
+import importlib.util
+import logging
+
+logger = logging.getLogger("backend")
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+
+@lru_cache(maxsize=None)
+def arrow_available() -> bool:
+    """Return whether pyarrow is installed, without importing it.
+
+    Arrow transport is optional, JSON keeps working without it. pyarrow is only
+    imported by the first request that sends or asks for an Arrow stream.
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+def sends_arrow(request: Request) -> bool:
+    """Return whether the request body is an Arrow IPC stream."""
+    return request.headers.get("content-type", "").startswith(ARROW_STREAM)
+
+def accepts_arrow(request: Request) -> bool:
+    """Return whether the client asked for an Arrow IPC stream response and it can be served."""
+    return arrow_available() and ARROW_STREAM in request.headers.get("accept", "")
+
+def read_texts(body: bytes) -> list:
+    """Read the texts of an Arrow IPC stream body.
+
+    Args:
+        body (bytes): Arrow IPC stream whose first column holds the texts
+
+    Raises:
+        ValueError: if the first column is no string column or holds nulls
+
+    Returns:
+        list: the texts of the first column
+    """
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(body).read_all()
+    if table.num_columns == 0:
+        return []
+    column = table.column(0)
+    # the JSON path gets these checks from BulkTextRequest
+    if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+        raise ValueError(f"The text column must be of type string, not {column.type}.")
+    if column.null_count:
+        raise ValueError(f"The text column holds {column.null_count} nulls.")
+    return column.to_pylist()
+
+def columns_response(columns: dict) -> Response:
+    """Serialize equally long numeric result columns into an Arrow IPC stream response.
+
+    Args:
+        columns (dict): column name -> list of numbers, None for missing values
+
+    Returns:
+        Response: response with the Arrow IPC stream of float64 columns as body
+    """
+    import pyarrow as pa
+
+    table = pa.table({name: pa.array(values, type=pa.float64()) for name, values in columns.items()})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return Response(content=sink.getvalue().to_pybytes(), media_type=ARROW_STREAM)
@@ -0,0 +1,25 @@
+from pathlib import Path
+import json
+import logging
+
+logger = logging.getLogger("backend")
+
+CONFIG_PATH = Path(__file__).parent.parent / "config.json"
+
+_config = None
+
+def get_config() -> dict:
+    """Load config.json once and return it.
+
+    Returns:
+        dict: the parsed configuration, empty if the file is missing
+    """
+    global _config
+    if _config is None:
+        try:
+            with open(CONFIG_PATH, "r") as f:
+                _config = json.load(f)
+        except FileNotFoundError:
+            logger.warning("No config file found at %s, using defaults.", CONFIG_PATH)
+            _config = {}
+    return _config
@@ -0,0 +1,30 @@
+from fastapi import Request
+from typing import Optional
+from nlp import SentimentAnalyser, MicroBatcher, BulkAnalyser, ResultCache, JobQueue
+
+# The analysis resources live on app.state; they are created and warmed up by the
+# lifespan hook in api_app.py and shared by every request.
+
+def get_analyser(request: Request) -> SentimentAnalyser:
+    """Return the application wide sentiment analyser."""
+    return request.app.state.analyser
+
+def get_micro_batcher(request: Request) -> Optional[MicroBatcher]:
+    """Return the micro batcher of /analyse, None if micro batching is disabled."""
+    return getattr(request.app.state, "micro_batcher", None)
+
+def get_bulk_analyser(request: Request) -> BulkAnalyser:
+    """Return the application wide bulk analyser."""
+    return request.app.state.bulk_analyser
+
+def get_result_cache(request: Request) -> ResultCache:
+    """Return the application wide result cache."""
+    return request.app.state.result_cache
+
+def get_sentence_cache(request: Request) -> ResultCache:
+    """Return the application wide cache of sentence scores."""
+    return request.app.state.sentence_cache
+
+def get_job_queue(request: Request) -> JobQueue:
+    """Return the application wide bulk job queue."""
+    return request.app.state.job_queue
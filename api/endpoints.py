@@ -1,7 +1,19 @@
-from fastapi import APIRouter, Query
-from nlp import SentimentAnalyser
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from nlp import SentimentAnalyser, MicroBatcher, BulkAnalyser, ResultCache, JobQueue
+from nlp.metrics import REGISTRY, STAGE_SECONDS
+from nlp.ingest import parse_csv_line
+from nlp.summary import SKETCH_BINS, SentimentSummary
 from .models import TextRequest, BulkTextRequest
+from .dependencies import get_analyser, get_micro_batcher, get_bulk_analyser, get_result_cache, get_sentence_cache, get_job_queue
+from .streaming import RequestStreamingResponse, iter_request_lines
+from . import arrow
 
+from typing import Optional
+import json
 import logging
 
 logger = logging.getLogger("backend")
@@ -13,32 +25,222 @@ def read_root():
     return {"API": "Running"}
 
 
+@router.get("/ready")
+def read_ready(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(status_code=503, content={"ready": False})
+    return {"ready": True}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def read_metrics():
+    return REGISTRY.render()
+
+
+@router.get("/cache/stats")
+def cache_stats(
+    cache: ResultCache = Depends(get_result_cache),
+    sentence_cache: ResultCache = Depends(get_sentence_cache),
+):
+    return {**cache.stats(), "sentences": sentence_cache.stats()}
+
+
 @router.post("/analyse")
 def analyze_text(
     type: str = Query("full", description="Analysis type: 'full' or 'sentence'"),
+    sentences: bool = Query(False, description="Include the score of every sentence, type 'sentence' only"),
     body: TextRequest = TextRequest(text=""),
+    analyser: SentimentAnalyser = Depends(get_analyser),
+    cache: ResultCache = Depends(get_result_cache),
+    sentence_cache: ResultCache = Depends(get_sentence_cache),
+    batcher: Optional[MicroBatcher] = Depends(get_micro_batcher),
 ):
     text = body.text
-    analyser = SentimentAnalyser()
-    if type == "full":
-        result = analyser.analyse_text_full(text)
-    elif type == "sentence":
-        result = analyser.analyse_text_per_sentence(text)
-    else:
-        logger.error(f"Invalid type: {type}")
+    if type not in ("full", "sentence"):
+        logger.error("Invalid type: %s", type)
         return {"error": "Invalid type. Use 'full' or 'sentence'."}
-    confidence = analyser.sentiment_confidence_score(text)
-    return {"type": type, "result": result, "confidence": confidence}
+    if type == "sentence" and sentences:
+        # unchanged sentences of an edited text come from the sentence cache
+        analysis = analyser.analyse_sentences(text, cache=sentence_cache, include_sentences=True)
+        return {"type": type, "result": analysis["sentence"], "confidence": analysis["confidence"],
+                "sentences": analysis["sentences"]}
+    key = cache.key(text, type)
+    cached = cache.get(key)
+    if cached is None:
+        if type == "sentence":
+            analysis = analyser.analyse_sentences(text, cache=sentence_cache)
+        elif batcher is not None:
+            # concurrent requests are analysed together in one batch
+            analysis = batcher.analyse(text, modes=(type, "confidence"))
+        else:
+            analysis = analyser.analyse(text, modes=(type, "confidence"))
+        cached = {"result": analysis[type], "confidence": analysis["confidence"]}
+        cache.put(key, cached)
+    return {"type": type, "result": cached["result"], "confidence": cached["confidence"]}
+
+async def read_bulk_texts(request: Request) -> list:
+    """Read the texts of a bulk request, sent either as JSON or as an Arrow IPC stream."""
+    body = await request.body()
+    with STAGE_SECONDS.time("parse"):
+        if arrow.sends_arrow(request):
+            if not arrow.arrow_available():
+                raise HTTPException(status_code=415, detail="Arrow requests need pyarrow installed on the server.")
+            try:
+                return arrow.read_texts(body)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            except Exception as e:
+                logger.error("Invalid Arrow body: %s", e)
+                raise HTTPException(status_code=400, detail="Invalid Arrow IPC stream.")
+        if not body:
+            return []
+        try:
+            return BulkTextRequest.model_validate_json(body).texts
+        except ValidationError as e:
+            raise RequestValidationError(e.errors())
 
-@router.post("/analyse/bulk")
+@router.post(
+    "/analyse/bulk",
+    openapi_extra={"requestBody": {"content": {
+        "application/json": {"schema": BulkTextRequest.model_json_schema()},
+        arrow.ARROW_STREAM: {"schema": {"type": "string", "format": "binary"}},
+    }}},
+)
 def analyze_text_bulk(
-    body: BulkTextRequest = BulkTextRequest(texts=[]),
+    request: Request,
+    texts: list = Depends(read_bulk_texts),
+    bulk_analyser: BulkAnalyser = Depends(get_bulk_analyser),
+    cache: ResultCache = Depends(get_result_cache),
+):
+    if arrow.accepts_arrow(request):
+        # columnar response: numeric columns aligned with the request order, no texts echoed
+        return arrow.columns_response(bulk_analyser.analyse_columns(texts, cache=cache))
+    return bulk_analyser.analyse(texts, cache=cache)
+
+@router.post("/jobs/bulk", status_code=202)
+def submit_bulk_job(
+    texts: list = Depends(read_bulk_texts),
+    job_queue: JobQueue = Depends(get_job_queue),
+):
+    return job_queue.submit(texts)
+
+@router.get("/jobs/{job_id}")
+def read_bulk_job(
+    job_id: str,
+    offset: int = Query(0, ge=0, description="Index of the first result to return"),
+    limit: int = Query(1000, ge=0, le=10000, description="Maximum number of results to return"),
+    job_queue: JobQueue = Depends(get_job_queue),
 ):
-    texts = body.texts
-    analyser = SentimentAnalyser()
-    results = []
-    for text in texts:
-        result = analyser.analyse_text_full(text)
-        confidence = analyser.sentiment_confidence_score(text)
-        results.append({"text": text, "result": result, "confidence": confidence})
-    return results
\ No newline at end of file
+    job = job_queue.get(job_id, offset=offset, limit=limit)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+def _parse_line(line: str, is_csv: bool) -> str:
+    """Extract the text of a single NDJSON or CSV body line.
+
+    Raises:
+        ValueError: if the line is malformed or its text is not a string
+        KeyError: if an NDJSON object has no "text"
+    """
+    if is_csv:
+        return parse_csv_line(line)
+    item = json.loads(line)
+    text = item["text"] if isinstance(item, dict) else item
+    if not isinstance(text, str):
+        raise ValueError(f"the text must be a string, not {type(text).__name__}")
+    return text
+
+@router.post("/analyse/bulk/stream")
+async def analyze_text_bulk_stream(
+    request: Request,
+    bulk_analyser: BulkAnalyser = Depends(get_bulk_analyser),
+    cache: ResultCache = Depends(get_result_cache),
+):
+    """Analyse an NDJSON or CSV body line by line and stream the results back as NDJSON.
+
+    The body is either NDJSON (one JSON string or {"text": ...} object per line) or,
+    with a text/csv content type, a one column ";"-delimited CSV without header and
+    one row per line. A malformed line, e.g. one with several CSV fields, gets an error
+    result in its place.
+    Texts are analysed in windows of one chunk per bulk worker, so memory does not grow
+    with the size of the upload. Results are written while the body is still read, so
+    clients must read the response while they send: one that sends the whole body first,
+    like requests does, stalls with it once the socket buffers are full.
+    """
+    is_csv = request.headers.get("content-type", "").startswith("text/csv")
+    window_size = bulk_analyser.chunk_size * bulk_analyser.workers
+
+    async def analyse_window(window: list) -> str:
+        texts = [text for text in window if not isinstance(text, Exception)]
+        analysed = iter(await run_in_threadpool(bulk_analyser.analyse, texts, cache))
+        lines = []
+        for text in window:
+            if isinstance(text, Exception):
+                lines.append(json.dumps({"error": f"Malformed line: {text}"}))
+            else:
+                lines.append(json.dumps(next(analysed)))
+        return "\n".join(lines) + "\n"
+
+    async def results():
+        window = []
+        total = 0
+        malformed = 0
+        async for line in iter_request_lines(request):
+            if not line.strip():
+                continue
+            try:
+                window.append(_parse_line(line, is_csv))
+            except (ValueError, KeyError) as e:
+                if not malformed:
+                    logger.warning("Skipping malformed line: %s", e)
+                malformed += 1
+                window.append(e)
+            if len(window) >= window_size:
+                yield await analyse_window(window)
+                total += len(window)
+                window = []
+        if window:
+            yield await analyse_window(window)
+            total += len(window)
+        logger.info("Streamed bulk analysis of %d lines completed, %d malformed.", total, malformed)
+
+    return RequestStreamingResponse(results(), media_type="application/x-ndjson")
+
+@router.post("/analyse/bulk/summary")
+async def summarise_text_bulk(
+    request: Request,
+    bins: int = Query(20, ge=1, le=SKETCH_BINS, description=f"Histogram bins per score, a divisor of {SKETCH_BINS}"),
+    bulk_analyser: BulkAnalyser = Depends(get_bulk_analyser),
+):
+    """Analyse an NDJSON or CSV body line by line and return only the distribution of the results.
+
+    Takes the same bodies as /analyse/bulk/stream. Every window of texts is folded into
+    one running summary, so memory stays constant however many texts are sent and the
+    response holds counts, moments, quantiles, histograms and category counts per
+    score instead of one row per text.
+    """
+    if SKETCH_BINS % bins:
+        raise HTTPException(status_code=400, detail=f"bins must divide {SKETCH_BINS}.")
+    is_csv = request.headers.get("content-type", "").startswith("text/csv")
+    window_size = bulk_analyser.chunk_size * bulk_analyser.workers
+    summary = SentimentSummary()
+    window = []
+    malformed = 0
+    async for line in iter_request_lines(request):
+        if not line.strip():
+            continue
+        try:
+            window.append(_parse_line(line, is_csv))
+        except (ValueError, KeyError) as e:
+            if not malformed:
+                logger.warning("Skipping malformed line: %s", e)
+            malformed += 1
+            continue
+        if len(window) >= window_size:
+            await run_in_threadpool(bulk_analyser.summarise, window, summary)
+            window = []
+    if window:
+        await run_in_threadpool(bulk_analyser.summarise, window, summary)
+    logger.info("Summarised %d texts, %d malformed lines.", summary.count + summary.failed, malformed)
+    return {**summary.to_dict(bins), "malformed": malformed}
@@ -0,0 +1,38 @@
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+
+
+class RequestStreamingResponse(StreamingResponse):
+    """StreamingResponse for endpoints that keep reading the request body while responding.
+
+    Starlette's StreamingResponse listens for client disconnects on receive(), which
+    would swallow the request body chunks the body iterator is still reading. Here the
+    body iterator owns receive() and a disconnect surfaces as ClientDisconnect from it.
+    """
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+        if self.background is not None:
+            await self.background()
+
+
+async def iter_request_lines(request: Request):
+    """Yield the decoded lines of a request body as they arrive.
+
+    Args:
+        request (Request): the incoming request
+
+    Yields:
+        str: one line of the body without its line break
+    """
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8").rstrip("\r")
@@ -1,17 +1,91 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+import anyio.to_thread
 import os
 from pathlib import Path
+from contextlib import asynccontextmanager
 from api import endpoints
+from api.config import get_config
+from nlp import SentimentAnalyser, MicroBatcher, BulkAnalyser, ResultCache, JobQueue
+from nlp.metrics import REQUESTS, REQUEST_SECONDS, IN_FLIGHT, start_request_profile, stop_request_profile
 from fastapi.middleware.cors import CORSMiddleware
+from logging_setup import setup_logging
+import cProfile
 import logging
-from logging.config import fileConfig 
+import random
+import time
 
 os.chdir(Path(__file__).parent)
 
-app = FastAPI(title="Sentiment Analysis API")
-fileConfig("./logging.ini")
+setup_logging("./logging.ini")
 logger = logging.getLogger("backend")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create and warm up the shared analysis resources before the server accepts requests."""
+    config = get_config()
+    if config.get("threadpool_size"):
+        # the synchronous endpoints run on this pool, 40 threads by default
+        anyio.to_thread.current_default_thread_limiter().total_tokens = config["threadpool_size"]
+    analyser = SentimentAnalyser(backend=config.get("analyser_backend", "textblob"),
+                                 segmenter=config.get("sentence_segmenter", "punkt"))
+    # sentence results depend on the segmenter, keep them apart in a persistent cache
+    namespace = analyser.backend.name
+    if analyser.backend.segmenter != "punkt":
+        namespace = f"{namespace}+{analyser.backend.segmenter}"
+    analyser.warm_up()
+    app.state.analyser = analyser
+    app.state.micro_batcher = None
+    if config.get("micro_batch_size", 0) > 1:
+        app.state.micro_batcher = MicroBatcher(
+            analyser,
+            max_batch_size=config["micro_batch_size"],
+            max_wait=config.get("micro_batch_wait_ms", 5) / 1000,
+        )
+    app.state.bulk_analyser = BulkAnalyser(
+        workers=config.get("bulk_workers", 0),
+        chunk_size=config.get("bulk_chunk_size", 250),
+        analyser=analyser,
+    )
+    app.state.bulk_analyser.warm_up()
+    app.state.result_cache = ResultCache(
+        max_size=config.get("cache_size", 10000),
+        ttl=config.get("cache_ttl", 0),
+        path=config.get("cache_path"),
+        namespace=namespace,
+        max_rows=config.get("cache_max_rows", 0),
+        prune_interval=config.get("cache_prune_interval", 300),
+    )
+    app.state.sentence_cache = ResultCache(
+        max_size=config.get("sentence_cache_size", 100000),
+        namespace=namespace,
+        name="sentences",
+    )
+    app.state.job_queue = JobQueue(
+        app.state.bulk_analyser,
+        cache=app.state.result_cache,
+        path=config.get("jobs_path", "jobs.db"),
+        workers=config.get("job_workers", 2),
+        chunk_size=config.get("job_chunk_size", 1000),
+        lease_seconds=config.get("job_lease_seconds", 30),
+    )
+    # every serve.py worker takes over the unfinished jobs no live worker holds a lease on
+    app.state.job_queue.resume()
+    app.state.ready = True
+    logger.info("API ready.")
+    yield
+    app.state.ready = False
+    app.state.job_queue.shutdown()
+    if app.state.micro_batcher is not None:
+        app.state.micro_batcher.shutdown()
+    app.state.bulk_analyser.shutdown()
+    app.state.result_cache.close()
+    logger.info("API shut down.")
+
+
+app = FastAPI(title="Sentiment Analysis API", lifespan=lifespan)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["https://localhost:3000"], # api and app running on same machine atm, so no effect
@@ -20,5 +94,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+PROFILE_SAMPLE_RATE = get_config().get("profile_sample_rate", 0)
+PROFILE_DIR = Path(get_config().get("profile_dir", "profiles"))
+MAX_IN_FLIGHT = get_config().get("max_in_flight", 0)
+# health and monitoring routes are answered even when the worker is saturated
+ADMISSION_EXEMPT = ("/", "/ready", "/metrics")
+
+
+class AdmissionMiddleware:
+    """Answer 429 while MAX_IN_FLIGHT requests are being handled, instead of queueing more work.
+
+    Clients are told to retry after a second, so an overloaded worker sheds load
+    right away instead of letting every request time out in the threadpool queue.
+    As a plain ASGI middleware it holds a request's slot until the whole response is
+    sent, so the streamed bulk endpoints, which read and analyse their body while
+    responding, count for as long as they work.
+    """
+    def __init__(self, app):
+        self.app = app
+        self.admitted = 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not MAX_IN_FLIGHT or scope["path"] in ADMISSION_EXEMPT:
+            await self.app(scope, receive, send)
+            return
+        if self.admitted >= MAX_IN_FLIGHT:
+            response = JSONResponse(status_code=429, content={"detail": "Too many requests in flight, retry later."},
+                                    headers={"Retry-After": "1"})
+            await response(scope, receive, send)
+            return
+        self.admitted += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.admitted -= 1
+
+
+app.add_middleware(AdmissionMiddleware)
+
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    """Count and time every request, and cProfile a sample of them if enabled."""
+    IN_FLIGHT.inc()
+    profile = cProfile.Profile() if PROFILE_SAMPLE_RATE and random.random() < PROFILE_SAMPLE_RATE else None
+    token = start_request_profile(profile) if profile is not None else None
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        REQUEST_SECONDS.observe(time.perf_counter() - start, path)
+        REQUESTS.inc(1, request.method, path, str(status))
+        IN_FLIGHT.dec()
+        if profile is not None:
+            stop_request_profile(token)
+            PROFILE_DIR.mkdir(exist_ok=True)
+            profile_path = PROFILE_DIR / f"{time.time_ns()}_{request.method}{path.replace('/', '_')}.prof"
+            profile.dump_stats(profile_path)
+            logger.info("Request profile written to %s", profile_path)
+
 app.include_router(endpoints.router)
-logger.info("API initialized and router included.")
\ No newline at end of file
+logger.info("API initialized and router included.")
@@ -1,13 +1,13 @@
 import os
 from pathlib import Path 
-from logging.config import fileConfig 
 import logging 
 import streamlit as st
 import json
-from modules import single_text_analysis_builder, bulk_analysis_builder
+import modules
+from logging_setup import setup_logging
 
 os.chdir(Path(__file__).parent)
-fileConfig("./logging.ini")
+setup_logging("./logging.ini")
 
 with open("config.json", "r") as f:
     config = json.load(f)
@@ -22,9 +22,9 @@ def main():
         ("Single Text Analysis", "Bulk Analysis")
     )
     if page == "Single Text Analysis":
-        single_text_analysis_builder(URL)
+        modules.single_text_analysis_builder(URL)
     elif page == "Bulk Analysis":
-        bulk_analysis_builder(URL)
+        modules.bulk_analysis_builder(URL)
 
 if __name__ == "__main__":
     main()
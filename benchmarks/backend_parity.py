@@ -0,0 +1,85 @@
+"""Compare an analyser backend against the TextBlob backend on the bundled test data.
+
+Reports the throughput of both backends and, per result column, the mean absolute
+difference and the share of texts within the tolerance. The reference is the TextBlob
+backend with the same sentence segmenter, Punkt by default. Exits non-zero if a column
+falls below its required share, see TOLERANCE and REQUIRED_SHARE.
+
+Usage:
+    python -m benchmarks.backend_parity
+    python -m benchmarks.backend_parity --backend lexicon --rows 20000
+    python -m benchmarks.backend_parity --segmenter rules
+"""
+from pathlib import Path
+import argparse
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+from nlp.analyser import ANALYSIS_MODES
+from nlp.backends import create_backend
+from benchmarks.suite import load_bundled
+
+# largest difference to TextBlob that still counts as the same result
+TOLERANCE = 0.05
+
+# share of texts that must be within TOLERANCE, per result column. Both backends score
+# the sentences of split_sentences, so the sentence columns only differ where a score
+# does; the confidence counts words with the lexicon backend's own tokenizer. Measured
+# on the bundled data with the Punkt segmenter: at least 99.7% for every column but
+# the confidence, 97.5% for the confidence, 100% for total_sentences.
+REQUIRED_SHARE = {
+    "polarity": 0.99,
+    "subjectivity": 0.99,
+    "average_polarity": 0.99,
+    "sum_of_polarities": 0.99,
+    "average_subjectivity": 0.99,
+    "sum_of_subjectivities": 0.99,
+    "total_sentences": 0.99,
+    "confidence": 0.95,
+}
+
+
+def score(backend, texts: list):
+    """Score the texts in one batch and return the result columns and the elapsed seconds."""
+    start = time.perf_counter()
+    columns = backend.score_batch(texts, ANALYSIS_MODES)
+    return columns, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", default="lexicon", help="backend compared against textblob")
+    parser.add_argument("--rows", type=int, default=0, help="corpus size, 0 keeps the bundled data as is")
+    parser.add_argument("--segmenter", default="punkt", help="sentence segmenter of both backends")
+    args = parser.parse_args()
+
+    texts = load_bundled(args.rows)
+    reference_backend = create_backend("textblob", args.segmenter)
+    candidate_backend = create_backend(args.backend, args.segmenter)
+    reference_backend.warm_up()
+    candidate_backend.warm_up()
+    reference, reference_seconds = score(reference_backend, texts)
+    candidate, candidate_seconds = score(candidate_backend, texts)
+
+    print(f"textblob: {len(texts) / reference_seconds:,.0f} rows/sec")
+    print(f"{args.backend}: {len(texts) / candidate_seconds:,.0f} rows/sec "
+          f"({reference_seconds / candidate_seconds:.1f}x)")
+    print(f"{'column':<24} {'mean abs diff':>14} {'within':>8} {'required':>9}")
+    failed = []
+    for name, required in REQUIRED_SHARE.items():
+        difference = np.abs(np.nan_to_num(reference[name]) - np.nan_to_num(candidate[name]))
+        within = float(np.mean(difference <= TOLERANCE)) if len(texts) else 1.0
+        flag = "" if within >= required else "  FAILED"
+        print(f"{name:<24} {difference.mean():>14.4f} {within:>8.1%} {required:>9.0%}{flag}")
+        if flag:
+            failed.append(name)
+    if failed:
+        print(f"{len(failed)} columns out of tolerance: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Measure /analyse/bulk engine throughput (rows/sec) for growing worker counts.
+
+Usage:
+    python -m benchmarks.bulk_scaling --rows 20000 --chunk-size 250
+"""
+from pathlib import Path
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nlp import BulkAnalyser
+from benchmarks.suite import load_bundled
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=250)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    texts = load_bundled(args.rows)
+    worker_counts = sorted({1, *[2 ** i for i in range(1, args.max_workers.bit_length()) if 2 ** i <= args.max_workers], args.max_workers})
+    baseline = None
+    print(f"{'workers':>8} {'seconds':>10} {'rows/sec':>12} {'speedup':>8}")
+    for workers in worker_counts:
+        bulk = BulkAnalyser(workers=workers, chunk_size=args.chunk_size)
+        # the first call starts and warms the pool, it is not part of the measurement
+        bulk.analyse(texts[:args.chunk_size * workers])
+        start = time.perf_counter()
+        bulk.analyse(texts)
+        elapsed = time.perf_counter() - start
+        bulk.shutdown()
+        rate = len(texts) / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} {elapsed:>10.2f} {rate:>12.0f} {rate / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
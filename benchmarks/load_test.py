@@ -0,0 +1,112 @@
+"""Load test of serve.py for growing worker counts.
+
+Starts serve.py with every requested number of workers, sends /analyse requests from
+concurrent clients for a fixed duration and reports throughput, latency percentiles
+and the share of requests rejected with 429.
+
+Usage:
+    python -m benchmarks.load_test
+    python -m benchmarks.load_test --workers 1,2,4 --concurrency 64 --duration 20
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import argparse
+import itertools
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import requests
+from benchmarks.suite import load_bundled, percentiles
+
+ROOT = Path(__file__).parent.parent
+
+
+def wait_ready(url: str, timeout: float = 180.0):
+    """Poll /ready until the server answers 200."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(f"{url}/ready", timeout=1).status_code == 200:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.5)
+    raise TimeoutError(f"{url} not ready after {timeout}s")
+
+
+def client(url: str, texts, analysis_type: str, deadline: float) -> tuple:
+    """Send requests one after the other until the deadline.
+
+    Returns:
+        tuple: latencies of the successful requests, number of 429 answers and of errors
+    """
+    session = requests.Session()
+    latencies = []
+    rejected = 0
+    errors = 0
+    while time.monotonic() < deadline:
+        start = time.perf_counter()
+        try:
+            response = session.post(f"{url}/analyse", params={"type": analysis_type},
+                                    json={"text": next(texts)}, timeout=30)
+        except requests.RequestException:
+            errors += 1
+            continue
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+        elif response.status_code == 429:
+            rejected += 1
+        else:
+            errors += 1
+    session.close()
+    return latencies, rejected, errors
+
+
+def run(workers: int, port: int, texts: list, concurrency: int, duration: float, analysis_type: str) -> dict:
+    """Start serve.py with the given number of workers and load it."""
+    url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen([sys.executable, "serve.py", "--workers", str(workers), "--port", str(port)], cwd=ROOT)
+    try:
+        wait_ready(url)
+        # distinct texts per request, the result cache would answer repeated ones
+        corpus = itertools.cycle([f"{text} #{index}" for index, text in enumerate(texts)])
+        deadline = time.monotonic() + duration
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(client, url, corpus, analysis_type, deadline) for _ in range(concurrency)]
+            results = [future.result() for future in futures]
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+    latencies = [latency for result in results for latency in result[0]]
+    summary = percentiles(latencies) if latencies else {"requests": 0}
+    summary["rows_per_sec"] = len(latencies) / duration
+    summary["rejected"] = sum(result[1] for result in results)
+    summary["errors"] = sum(result[2] for result in results)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="comma separated worker counts")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per worker count")
+    parser.add_argument("--type", default="full", help="analysis type, full or sentence")
+    parser.add_argument("--port", type=int, default=8090, help="port serve.py listens on")
+    args = parser.parse_args()
+
+    texts = load_bundled()
+    print(f"{'workers':>7} {'req/sec':>9} {'p50 ms':>8} {'p99 ms':>8} {'429':>6} {'errors':>6}")
+    baseline = None
+    for workers in (int(value) for value in args.workers.split(",")):
+        summary = run(workers, args.port, texts, args.concurrency, args.duration, args.type)
+        baseline = baseline or summary["rows_per_sec"]
+        print(f"{workers:>7} {summary['rows_per_sec']:>9,.0f} {summary.get('p50_ms', 0):>8.1f} "
+              f"{summary.get('p99_ms', 0):>8.1f} {summary['rejected']:>6} {summary['errors']:>6}"
+              f"  ({summary['rows_per_sec'] / max(baseline, 1e-9):.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Validate the rule based sentence segmenter against Punkt and compare their speed.
+
+Sentence boundaries of both segmenters are compared on the bundled test data. Punkt
+splits runs like "!!" into a sentence and a lone "!", so punctuation-only sentences
+are merged into the one before on both sides. The reference is the trained English
+Punkt model the "punkt" segmenter uses (nltk.download("punkt_tab")). Without it, the
+untrained Punkt tokenizer, which knows no abbreviations, stands in for both the
+boundaries and the speed, and the report says so; --require-trained makes that an error.
+
+The speed is measured on multi-paragraph documents built from the test data, for
+the segmentation alone and for the complete per-sentence analysis of the TextBlob
+backend. Exits non-zero if the boundary precision or recall is below REQUIRED.
+
+Usage:
+    python -m benchmarks.segmenter
+    python -m benchmarks.segmenter --documents 200 --paragraphs 10
+    python -m benchmarks.segmenter --require-trained
+"""
+from pathlib import Path
+import argparse
+import re
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nltk.tokenize.punkt import PunktSentenceTokenizer
+from textblob.en import sentiment as pattern_sentiment
+from nlp.segmenter import sentence_spans
+from benchmarks.suite import load_bundled
+
+# minimum boundary precision and recall against Punkt
+REQUIRED = 0.95
+_WORD = re.compile(r"\w")
+
+
+def load_punkt():
+    """Return the trained English Punkt tokenizer, or the untrained one if it is not installed."""
+    try:
+        from nltk.tokenize import PunktTokenizer
+        return PunktTokenizer("english"), "trained"
+    except (ImportError, LookupError):
+        pass
+    try:
+        import nltk.data
+        return nltk.data.load("tokenizers/punkt/english.pickle"), "trained"
+    except LookupError:
+        return PunktSentenceTokenizer(), "untrained"
+
+
+def boundaries(text: str, spans) -> set:
+    """Return the end offsets of all but the last sentence, merging punctuation-only sentences."""
+    ends = []
+    for start, end in spans:
+        if ends and not _WORD.search(text, start, end):
+            ends[-1] = end
+        else:
+            ends.append(end)
+    return set(ends[:-1])
+
+
+def validate(texts: list, punkt) -> dict:
+    """Compare the sentence boundaries of both segmenters text by text."""
+    matched = extra = missed = identical = 0
+    for text in texts:
+        reference = boundaries(text, punkt.span_tokenize(text))
+        candidate = boundaries(text, sentence_spans(text))
+        matched += len(reference & candidate)
+        extra += len(candidate - reference)
+        missed += len(reference - candidate)
+        identical += reference == candidate
+    return {
+        "precision": matched / max(matched + extra, 1),
+        "recall": matched / max(matched + missed, 1),
+        "identical": identical / max(len(texts), 1),
+    }
+
+
+def documents(texts: list, count: int, paragraphs: int, per_paragraph: int = 10) -> list:
+    """Build multi-paragraph documents from consecutive texts of the corpus."""
+    size = paragraphs * per_paragraph
+    return [
+        "\n\n".join(" ".join(texts[(index * size + offset + line) % len(texts)] for line in range(per_paragraph))
+                    for offset in range(0, size, per_paragraph))
+        for index in range(count)
+    ]
+
+
+def timed(run, docs: list) -> float:
+    start = time.perf_counter()
+    for doc in docs:
+        run(doc)
+    return time.perf_counter() - start
+
+
+def score_sentences(sentences) -> tuple:
+    polarities = 0.0
+    subjectivities = 0.0
+    for sentence in sentences:
+        polarity, subjectivity = pattern_sentiment(sentence)
+        polarities += polarity
+        subjectivities += subjectivity
+    return polarities, subjectivities
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=100, help="number of benchmark documents")
+    parser.add_argument("--paragraphs", type=int, default=8, help="paragraphs of ten texts per document")
+    parser.add_argument("--require-trained", action="store_true",
+                        help="exit non-zero instead of comparing against the untrained Punkt tokenizer")
+    args = parser.parse_args()
+
+    texts = load_bundled()
+    punkt, model = load_punkt()
+    if model != "trained":
+        print('The trained English Punkt model is not installed (nltk.download("punkt_tab")), boundaries and '
+              "speed are compared against the untrained Punkt tokenizer instead.")
+        if args.require_trained:
+            sys.exit(1)
+    result = validate(texts, punkt)
+    print(f"boundaries vs {model} Punkt on {len(texts)} texts: precision {result['precision']:.1%}, "
+          f"recall {result['recall']:.1%}, identical texts {result['identical']:.1%}")
+
+    docs = documents(texts, args.documents, args.paragraphs)
+    characters = sum(map(len, docs)) / 1e6
+    score_sentences(["warm up the lexicon"])
+    runs = {
+        "segmentation": (lambda doc: list(punkt.span_tokenize(doc)), sentence_spans),
+        "segmentation + scoring": (lambda doc: score_sentences(punkt.tokenize(doc)),
+                                   lambda doc: score_sentences(doc[start:end] for start, end in sentence_spans(doc))),
+    }
+    print(f"{len(docs)} documents of {args.paragraphs} paragraphs, {characters:.1f}M characters")
+    for name, (reference_run, candidate_run) in runs.items():
+        reference_seconds = timed(reference_run, docs)
+        candidate_seconds = timed(candidate_run, docs)
+        print(f"{name:<24} {model} punkt {characters / reference_seconds:6.2f} MB/s   rules "
+              f"{characters / candidate_seconds:6.2f} MB/s   ({reference_seconds / candidate_seconds:.1f}x)")
+    failed = [name for name in ("precision", "recall") if result[name] < REQUIRED]
+    if failed:
+        print(f"{' and '.join(failed)} below {REQUIRED:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
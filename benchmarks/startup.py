@@ -0,0 +1,94 @@
+"""Import time budget of the entry points, measured with python -X importtime.
+
+Every entry module is imported in a fresh interpreter a few times and the fastest run
+is compared against its budget. Each entry also lists heavy modules it must not import
+at startup, because only the code paths that need them load them. Exits non-zero if
+an entry is over its budget or imports a forbidden module.
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --runs 10 --budget-scale 2
+"""
+from pathlib import Path
+import argparse
+import importlib.util
+import subprocess
+import sys
+
+ROOT = Path(__file__).parent.parent
+
+# module -> (budget in ms, modules it must not import, module it needs installed)
+ENTRY_POINTS = {
+    "api_app": (800, ("textblob", "nltk", "pandas", "pyarrow"), "fastapi"),
+    "nlp.ingest": (100, ("textblob", "nltk", "numpy", "pandas"), None),
+    "utils.logic": (250, ("pandas", "numpy", "pyarrow"), "requests"),
+    "app": (1500, ("altair", "modules.single", "modules.bulk"), "streamlit"),
+}
+_MARKER = "-- entry point --"
+
+
+def import_times(module: str) -> tuple:
+    """Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple: total milliseconds of the import, and the self time in microseconds of
+            every module it imported, interpreter startup excluded
+    """
+    code = f"import sys; sys.stderr.write({_MARKER!r} + '\\n'); import {module}"
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                             capture_output=True, text=True)
+    if process.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{process.stderr[-2000:]}")
+    lines = process.stderr.split(_MARKER, 1)[1].splitlines()
+    total = 0
+    modules = {}
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(own)
+        # nested imports are indented below the module that imported them
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total / 1000, modules
+
+
+def heaviest(modules: dict, count: int = 5) -> list:
+    """Sum the self times per top level package and return the largest ones."""
+    packages = {}
+    for name, own in modules.items():
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + own
+    return sorted(packages.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="imports per entry point, the fastest counts")
+    parser.add_argument("--budget-scale", type=float, default=1.0, help="factor applied to every budget")
+    args = parser.parse_args()
+
+    failed = []
+    print(f"{'entry point':<14} {'import ms':>9} {'budget':>7}   heaviest packages")
+    for module, (budget, forbidden, requires) in ENTRY_POINTS.items():
+        if requires and importlib.util.find_spec(requires) is None:
+            print(f"{module:<14} {'skipped':>9} {'':>7}   {requires} not installed")
+            continue
+        total, modules = min((import_times(module) for _ in range(max(1, args.runs))), key=lambda run: run[0])
+        budget *= args.budget_scale
+        packages = ", ".join(f"{package} {own / 1000:.0f}" for package, own in heaviest(modules))
+        print(f"{module:<14} {total:>9.0f} {budget:>7.0f}   {packages}")
+        if total > budget:
+            failed.append(f"{module} takes {total:.0f} ms to import, budget {budget:.0f} ms")
+        imported = [name for name in forbidden
+                    if any(loaded == name or loaded.startswith(f"{name}.") for loaded in modules)]
+        if imported:
+            failed.append(f"{module} imports {', '.join(imported)} at startup")
+    for failure in failed:
+        print(failure)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
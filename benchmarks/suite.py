@@ -0,0 +1,242 @@
+"""Reproducible performance suite for the analysis engine and the API.
+
+Measures per-method throughput of SentimentAnalyser (per text and batched) and end-to-end latency
+percentiles of /analyse and /analyse/bulk through an in-process ASGI client, on
+either the bundled test data or a seeded synthetic corpus. Results are written as
+JSON and can be compared against a stored baseline.
+
+Usage:
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --corpus synthetic --rows 100000 --words 40 --output run.json
+    python -m benchmarks.suite --baseline baseline.json --threshold 0.1
+"""
+from pathlib import Path
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from nlp import SentimentAnalyser, ResultCache
+from nlp.ingest import iter_csv_chunks
+
+DATA_PATH = Path(__file__).parent.parent / "test_data" / "sentiment_big_test.csv"
+
+METHODS = ("analyse_text_full", "analyse_text_per_sentence", "sentiment_confidence_score")
+
+
+def load_bundled(rows: int = 0) -> list:
+    """Load the bundled test texts, repeated up to rows if given.
+
+    The file is parsed as the CSV it is, with nlp.ingest like the server parses CSV
+    uploads, so quoted texts are unquoted and equal the texts pandas reads.
+    """
+    texts = [text for chunk, _ in iter_csv_chunks(str(DATA_PATH)) for text in chunk]
+    if rows:
+        texts = (texts * (rows // len(texts) + 1))[:rows]
+    return texts
+
+
+def synthetic_corpus(rows: int, words: int, seed: int = 42) -> list:
+    """Build a deterministic corpus of texts with a controlled number of words.
+
+    Words are drawn from the vocabulary of the bundled test data and grouped into
+    sentences of 5 to 15 words, so the mix of sentiment and filler words is realistic.
+
+    Args:
+        rows (int): number of texts
+        words (int): number of words per text
+        seed (int, optional): seed of the generator. Defaults to 42.
+
+    Returns:
+        list: the generated texts
+    """
+    rng = random.Random(seed)
+    vocabulary = sorted({word.strip(".,!?;:\"'()") for text in load_bundled() for word in text.split()} - {""})
+    texts = []
+    for _ in range(rows):
+        sentences = []
+        remaining = words
+        while remaining > 0:
+            length = min(remaining, rng.randint(5, 15))
+            sentence = " ".join(rng.choices(vocabulary, k=length))
+            sentences.append(sentence[0].upper() + sentence[1:] + rng.choice(".!?"))
+            remaining -= length
+        texts.append(" ".join(sentences))
+    return texts
+
+
+def percentiles(latencies: list) -> dict:
+    """Summarize request latencies in milliseconds."""
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        "requests": len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": pick(0.50),
+        "p90_ms": pick(0.90),
+        "p99_ms": pick(0.99),
+    }
+
+
+def bench_methods(texts: list, backend: str = "textblob", segmenter: str = "punkt") -> dict:
+    """Measure the throughput of every SentimentAnalyser method over the corpus."""
+    analyser = SentimentAnalyser(backend=backend, segmenter=segmenter)
+    analyser.warm_up()
+    results = {}
+    for method in METHODS + ("analyse",):
+        run = getattr(analyser, method)
+        start = time.perf_counter()
+        for text in texts:
+            run(text)
+        elapsed = time.perf_counter() - start
+        results[f"method.{method}"] = {"rows": len(texts), "seconds": elapsed, "rows_per_sec": len(texts) / elapsed}
+    start = time.perf_counter()
+    for _ in analyser.analyse_iter(texts):
+        pass
+    elapsed = time.perf_counter() - start
+    results["method.analyse_batch"] = {"rows": len(texts), "seconds": elapsed, "rows_per_sec": len(texts) / elapsed}
+    return results
+
+
+def bench_api(texts: list, requests: int, bulk_size: int, use_cache: bool, log_level: str,
+              backend: str = "textblob", segmenter: str = "punkt") -> dict:
+    """Measure end-to-end latency of the analysis endpoints through an in-process ASGI client.
+
+    The app is started with the given backend and segmenter instead of those of config.json.
+    """
+    from fastapi.testclient import TestClient
+    from api.config import get_config
+    from api_app import app
+
+    get_config().update(analyser_backend=backend, sentence_segmenter=segmenter)
+
+    # importing the app applies logging.ini, restore the requested level
+    logging.getLogger("backend").setLevel(log_level)
+    results = {}
+    with TestClient(app) as client:
+        loaded = app.state.analyser.backend
+        if (loaded.name, loaded.segmenter) != (backend, segmenter):
+            raise RuntimeError(f"The app loaded the {loaded.name} backend with {loaded.segmenter}, "
+                               f"not {backend} with {segmenter}.")
+        if not use_cache:
+            app.state.result_cache = ResultCache(max_size=0)
+            app.state.sentence_cache = ResultCache(max_size=0, name="sentences")
+        for analysis_type in ("full", "sentence"):
+            latencies = []
+            for text in texts[:requests]:
+                start = time.perf_counter()
+                client.post("/analyse", params={"type": analysis_type}, json={"text": text}).raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            results[f"api.analyse.{analysis_type}"] = percentiles(latencies)
+
+        latencies = []
+        start_all = time.perf_counter()
+        for offset in range(0, len(texts), bulk_size):
+            start = time.perf_counter()
+            client.post("/analyse/bulk", json={"texts": texts[offset:offset + bulk_size]}).raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - start_all
+        results["api.analyse_bulk"] = {
+            **percentiles(latencies),
+            "batch_size": bulk_size,
+            "rows_per_sec": len(texts) / elapsed,
+        }
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Compare two result sets and return the metrics that regressed beyond the threshold.
+
+    Throughput (rows_per_sec) regresses when it drops, latency (p50_ms, p90_ms) when it
+    rises, in both cases by more than threshold as a fraction of the baseline.
+    """
+    regressions = []
+    for key in ("corpus", "rows", "words", "with_cache", "backend", "segmenter"):
+        if current["meta"].get(key) != baseline.get("meta", {}).get(key):
+            print(f"Warning: baseline was measured with {key}={baseline.get('meta', {}).get(key)}, "
+                  f"this run uses {key}={current['meta'].get(key)}.")
+    print(f"{'metric':<45} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, metrics in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            continue
+        for key, higher_is_better in (("rows_per_sec", True), ("p50_ms", False), ("p90_ms", False)):
+            if key not in metrics or key not in base or not base[key]:
+                continue
+            change = (metrics[key] - base[key]) / base[key]
+            regressed = -change > threshold if higher_is_better else change > threshold
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{name + '.' + key:<45} {base[key]:>12.2f} {metrics[key]:>12.2f} {change:>+8.1%}{flag}")
+            if regressed:
+                regressions.append(f"{name}.{key}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", choices=("bundled", "synthetic"), default="bundled")
+    parser.add_argument("--rows", type=int, default=0, help="corpus size, 0 keeps the bundled data as is")
+    parser.add_argument("--words", type=int, default=20, help="words per synthetic text")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--api-requests", type=int, default=200, help="single text requests per analysis type")
+    parser.add_argument("--bulk-size", type=int, default=500, help="texts per /analyse/bulk request")
+    parser.add_argument("--with-cache", action="store_true", help="keep the API result cache enabled")
+    parser.add_argument("--backend", default="textblob", help="analyser backend of the method and API benchmarks")
+    parser.add_argument("--segmenter", default="punkt", help="sentence segmenter of the method and API benchmarks")
+    parser.add_argument("--skip-api", action="store_true")
+    parser.add_argument("--log-level", default="WARNING", help="level of the backend logger while measuring")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed relative regression")
+    args = parser.parse_args()
+
+    if args.corpus == "synthetic":
+        texts = synthetic_corpus(args.rows or 10000, args.words, seed=args.seed)
+    else:
+        texts = load_bundled(args.rows)
+
+    results = {}
+    logging.getLogger("backend").setLevel(args.log_level)
+    results.update(bench_methods(texts, args.backend, args.segmenter))
+    if not args.skip_api:
+        results.update(bench_api(texts, args.api_requests, args.bulk_size, args.with_cache, args.log_level,
+                                 args.backend, args.segmenter))
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "corpus": args.corpus,
+            "rows": len(texts),
+            "words": args.words if args.corpus == "synthetic" else None,
+            "seed": args.seed,
+            "with_cache": args.with_cache,
+            "backend": args.backend,
+            "segmenter": args.segmenter,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} metrics regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+from logging.config import fileConfig
+from logging.handlers import QueueHandler, QueueListener
+import atexit
+import logging
+import os
+import queue
+
+# Handlers configured in logging.ini write synchronously to the console and to files.
+# setup_logging moves them behind a queue per logger, so the logging call only puts
+# the record on the queue and a background thread formats and writes it.
+
+_listeners = []
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The standard handler renders the message before enqueueing it, which is only needed
+    when records cross a process boundary. Here the queue stays in process.
+    """
+    def prepare(self, record):
+        return record
+
+
+def _stop_listeners():
+    while _listeners:
+        _listeners.pop().stop()
+
+
+def _restart_listeners_in_child():
+    """Start fresh writer threads after a fork, the parent's threads do not exist in the child.
+
+    Records still queued at the time of the fork are written by the parent, so the child
+    drops its copies of them.
+    """
+    for index, listener in enumerate(_listeners):
+        while True:
+            try:
+                listener.queue.get_nowait()
+            except queue.Empty:
+                break
+        _listeners[index] = QueueListener(listener.queue, *listener.handlers, respect_handler_level=True)
+        _listeners[index].start()
+
+
+def setup_logging(config_path: str = "./logging.ini", loggers: tuple = ("root", "frontend", "backend")):
+    """Apply the logging configuration and move the handlers of the given loggers behind queues.
+
+    Safe to call repeatedly, e.g. on every Streamlit rerun: writer threads of an earlier
+    call are stopped before the configuration is applied again.
+
+    Args:
+        config_path (str, optional): fileConfig file to apply. Defaults to "./logging.ini".
+        loggers (tuple, optional): names of the loggers whose handlers are queued. Defaults to root, frontend and backend.
+    """
+    _stop_listeners()
+    fileConfig(config_path)
+    for name in loggers:
+        target = logging.getLogger() if name == "root" else logging.getLogger(name)
+        handlers = [handler for handler in target.handlers if not isinstance(handler, QueueHandler)]
+        if not handlers:
+            continue
+        records = queue.SimpleQueue()
+        listener = QueueListener(records, *handlers, respect_handler_level=True)
+        target.handlers = [_DeferredQueueHandler(records)]
+        listener.start()
+        _listeners.append(listener)
+
+
+atexit.register(_stop_listeners)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners_in_child)
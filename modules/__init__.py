@@ -1,2 +1,16 @@
-from .single import single_text_analysis_builder
-from .bulk import bulk_analysis_builder
\ No newline at end of file
+from importlib import import_module
+
+# The pages are imported when they are first shown, so the single text page does not
+# load the bulk page's dependencies and the other way around.
+_EXPORTS = {
+    "single_text_analysis_builder": ".single",
+    "bulk_analysis_builder": ".bulk",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
@@ -1,40 +1,91 @@
 import streamlit as st
 import logging
-from utils import RequestHandler
 from utils import SentimentCategorizer as sc
+from .caching import get_request_handler, upload_digest, get_bulk_result, store_bulk_result
 import pandas as pd
 
 logger = logging.getLogger("frontend")
 
+# uploads with more rows than this are analysed as a background job on the API
+JOB_THRESHOLD = 5000
+# uploads larger than this are read and analysed in chunks instead of loaded at once
+CHUNKED_THRESHOLD_BYTES = 20 * 1024 * 1024
+
+def analyse_upload(request_handler, uploaded_file, digest: str):
+    """Analyse an uploaded CSV through the API.
+
+    Args:
+        request_handler (RequestHandler): handler to make API calls.
+        uploaded_file (UploadedFile): the uploaded one column CSV.
+        digest (str): content hash of the upload, keeps a background job across reruns.
+
+    Returns:
+        DataFrame: the analysed texts, None if the analysis failed.
+    """
+    progress = st.progress(0.0, text="Analysing texts...")
+    if uploaded_file.size > CHUNKED_THRESHOLD_BYTES:
+        logger.debug("CSV uploaded with %d bytes, analysing in chunks.", uploaded_file.size)
+        update_progress = lambda done, total: progress.progress(done / total, text=f"Read {done / 1e6:.1f} of {total / 1e6:.1f} MB")
+        try:
+            analyzed_df = request_handler.analyse_csv_bulk(uploaded_file, progress_callback=update_progress)
+        except ValueError as e:
+            progress.empty()
+            st.error(str(e))
+            return None
+    else:
+        df = pd.read_csv(uploaded_file, header=None, delimiter=";")
+        if df.shape[1] != 1:
+            progress.empty()
+            st.error("CSV must have exactly one column containing text.")
+            return None
+        logger.debug("CSV uploaded with %d rows.", len(df))
+        update_progress = lambda done, total: progress.progress(done / total if total else 1.0, text=f"Analysed {done} of {total} texts")
+        if len(df) > JOB_THRESHOLD:
+            # keep the job id across reruns, so a rerun keeps polling instead of resubmitting
+            job_key = f"bulk_job_{digest}"
+            if job_key not in st.session_state:
+                st.session_state[job_key] = request_handler.submit_bulk_job(df)
+            analyzed_df = request_handler.analyse_full_text_bulk_job(
+                df, job_id=st.session_state[job_key], progress_callback=update_progress)
+            st.session_state.pop(job_key, None)
+        else:
+            analyzed_df = request_handler.analyse_full_text_bulk(df, progress_callback=update_progress)
+    progress.empty()
+    # the bulk requests return the input DataFrame when the API fails
+    if analyzed_df is None or "polarity" not in analyzed_df.columns:
+        st.error("Failed to analyse the CSV file.")
+        return None
+    return analyzed_df
+
 def bulk_analysis_builder(URL: str):
-    request_handler = RequestHandler(url=URL)
+    request_handler = get_request_handler(URL)
     st.title("Bulk Analysis")
     st.sidebar.title("Bulk Analysis")
 
 
     uploaded_file = st.sidebar.file_uploader("Upload CSV(Format: 1 Column, no Header)", type=["csv"])
-    result_df = None
 
     if uploaded_file is not None:
-        df = pd.read_csv(uploaded_file, header=None, delimiter=";")
-        if df.shape[1] != 1:
-            st.error("CSV must have exactly one column containing text.")
-            return
-        logger.debug(f"CSV uploaded with {len(df)} rows.")
-        analyzed_df = request_handler.analyse_full_text_bulk(df)
-        analyzed_df['polarity_category'] = analyzed_df['polarity'].apply(sc.categorize_polarity)
-        analyzed_df['subjectivity_category'] = analyzed_df['subjectivity'].apply(sc.categorize_subjectivity)
-        analyzed_df['confidence_category'] = analyzed_df['confidence'].apply(sc.categorize_confidence)
-        st.dataframe(analyzed_df, hide_index=True)
-
-        
-        csv = analyzed_df.to_csv(index=False,).encode('utf-8')
+        # reruns (downloads, sidebar changes) reuse the result until a different file is uploaded
+        digest = upload_digest(uploaded_file)
+        result = get_bulk_result(digest)
+        if result is None:
+            analyzed_df = analyse_upload(request_handler, uploaded_file, digest)
+            if analyzed_df is None:
+                return
+            analyzed_df['polarity_category'] = sc.categorize_polarity_batch(analyzed_df['polarity'])
+            analyzed_df['subjectivity_category'] = sc.categorize_subjectivity_batch(analyzed_df['subjectivity'])
+            analyzed_df['confidence_category'] = sc.categorize_confidence_batch(analyzed_df['confidence'])
+            csv = analyzed_df.to_csv(index=False,).encode('utf-8')
+            result = store_bulk_result(digest, analyzed_df, csv)
+        st.dataframe(result["result_df"], hide_index=True)
+
         st.sidebar.download_button(
             label="Download Results as CSV",
-            
-            data=csv,
+
+            data=result["csv"],
             file_name="sentiment_results.csv",
             mime="text/csv"
         )
     else:
-        st.write("Please upload a CSV file in the sidebar to begin analysis.")
\ No newline at end of file
+        st.write("Please upload a CSV file in the sidebar to begin analysis.")
@@ -0,0 +1,108 @@
+import streamlit as st
+import hashlib
+import logging
+from utils import RequestHandler
+
+logger = logging.getLogger("frontend")
+
+# Streamlit reruns the whole page on every interaction. The RequestHandler is shared
+# by all sessions and reruns, single text responses are cached by text and bulk
+# results are kept in the session, keyed by a hash of the uploaded content.
+
+# number of single text responses kept per analysis type and how long, in seconds
+TEXT_CACHE_ENTRIES = 512
+TEXT_CACHE_TTL = 3600
+BULK_RESULT_KEY = "bulk_result"
+
+
+class _UncachedResponse(Exception):
+    """Carries an error response out of a cached function, so it is not cached."""
+    def __init__(self, response: dict):
+        super().__init__(response.get("error"))
+        self.response = response
+
+
+@st.cache_resource
+def get_request_handler(url: str) -> RequestHandler:
+    """Return the RequestHandler of an API URL, created once and shared by every session.
+
+    Args:
+        url (str): base URL of the API
+
+    Returns:
+        RequestHandler: handler with its pooled connections
+    """
+    return RequestHandler(url=url)
+
+
+@st.cache_data(max_entries=TEXT_CACHE_ENTRIES, ttl=TEXT_CACHE_TTL, show_spinner=False)
+def _analyse_text(url: str, text: str, analysis_type: str) -> dict:
+    request_handler = get_request_handler(url)
+    if analysis_type == "full":
+        response = request_handler.analyse_full_text(text)
+    else:
+        response = request_handler.analyse_text_per_sentence(text, include_sentences=True)
+    if "error" in response:
+        raise _UncachedResponse(response)
+    return response
+
+
+def analyse_text(url: str, text: str, analysis_type: str = "full") -> dict:
+    """Analyse a text through the API, answering repeated texts from the cache.
+
+    Error responses are returned but not cached, so the next rerun asks the API again.
+
+    Args:
+        url (str): base URL of the API
+        text (str): text to be analysed
+        analysis_type (str, optional): "full" or "sentence", the latter with the scores of every sentence. Defaults to "full".
+
+    Returns:
+        dict: the response of RequestHandler.analyse_full_text or analyse_text_per_sentence
+    """
+    try:
+        return _analyse_text(url, text, analysis_type)
+    except _UncachedResponse as e:
+        return e.response
+
+
+def upload_digest(uploaded_file) -> str:
+    """Return a hash of the content of an uploaded file, computed once per upload.
+
+    Args:
+        uploaded_file (UploadedFile): file returned by st.file_uploader
+
+    Returns:
+        str: hex digest of the file content
+    """
+    key = f"upload_digest_{getattr(uploaded_file, 'file_id', uploaded_file.name)}"
+    if key not in st.session_state:
+        uploaded_file.seek(0)
+        st.session_state[key] = hashlib.file_digest(uploaded_file, "blake2b").hexdigest()
+        uploaded_file.seek(0)
+    return st.session_state[key]
+
+
+def get_bulk_result(digest: str):
+    """Return the bulk result this session stored for an upload digest, or None."""
+    stored = st.session_state.get(BULK_RESULT_KEY)
+    if stored is not None and stored["digest"] == digest:
+        logger.debug("Reusing the bulk result of upload %s.", digest[:12])
+        return stored
+    return None
+
+
+def store_bulk_result(digest: str, result_df, csv: bytes) -> dict:
+    """Keep the bulk result of an upload in the session, replacing the one of an earlier upload.
+
+    Args:
+        digest (str): content hash of the upload, see upload_digest
+        result_df (DataFrame): the analysed and categorized texts
+        csv (bytes): result_df encoded for the download button
+
+    Returns:
+        dict: the stored digest, result_df and csv
+    """
+    stored = {"digest": digest, "result_df": result_df, "csv": csv}
+    st.session_state[BULK_RESULT_KEY] = stored
+    return stored
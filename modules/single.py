@@ -1,9 +1,7 @@
 import streamlit as st
 import logging
-from utils import RequestHandler
 from utils import SentimentCategorizer as sc
-import pandas as pd
-import altair as alt
+from .caching import get_request_handler, analyse_text
 
 
 logger = logging.getLogger("frontend")
@@ -28,6 +26,10 @@ def build_graph(full_text_result, per_sentence_result):
     """
     polarity, subjectivity, confidence = 0, 0, 0
     if per_sentence_result or full_text_result:
+        # pandas and altair are only imported once there is something to chart
+        import altair as alt
+        import pandas as pd
+
         if full_text_result:
             confidence = full_text_result["confidence_nr"]
             polarity = full_text_result["polarity_nr"]
@@ -86,6 +88,10 @@ def display_sentiment_analysis_results(full_text_result, per_sentence_result, co
                 |Total Sentences | {per_sentence_result['total_sentences']}|
                 |Confidence | {per_sentence_result["confidence_nr"]}|
             """)
+            if per_sentence_result.get("sentences"):
+                import pandas as pd
+
+                st.dataframe(pd.DataFrame(per_sentence_result["sentences"]), hide_index=True)
         except Exception as e:
             logger.error(f"An error occured: {e}")
             st.error("An error occurred while processing the per sentence analysis results.")
@@ -99,10 +105,10 @@ def analyze_per_sentence_button(request_handler, text, per_sentence_result=None)
         per_sentence_result (_type_, optional): Placeholder for the return value. Defaults to None.
 
     Returns:
-        dict: per sentence analysis results including polarity, subjectivity, confidence, average polarity, sum of polarities, average subjectivity, sum of subjectivities, total sentences, and confidence number.
+        dict: per sentence analysis results including polarity, subjectivity, confidence, average polarity, sum of polarities, average subjectivity, sum of subjectivities, total sentences, confidence number and the scores of the single sentences.
     """
     if text:
-        result = request_handler.analyse_text_per_sentence(text)
+        result = analyse_text(request_handler.url, text, "sentence")
         average_polarity = result["result"]["average_polarity"]
         sum_of_polarities = result["result"]["sum_of_polarities"]
         average_subjectivity = result["result"]["average_subjectivity"]
@@ -122,7 +128,8 @@ def analyze_per_sentence_button(request_handler, text, per_sentence_result=None)
                                     "average_subjectivity": average_subjectivity,
                                     "sum_of_subjectivities": sum_of_subjectivities,
                                     "total_sentences": total_sentences,
-                                    "confidence_nr": confidence_nr }
+                                    "confidence_nr": confidence_nr,
+                                    "sentences": result.get("sentences", []) }
     else:
         st.error("Please enter some text to analyze.")
     return per_sentence_result
@@ -139,7 +146,7 @@ def analyze_full_text_button(request_handler, text, full_text_result=None):
         dict: full text analysis results including polarity, subjectivity, confidence, and their numerical values.
     """
     if text:
-        result = request_handler.analyse_full_text(text)
+        result = analyse_text(request_handler.url, text, "full")
 
         polarity = sc.categorize_polarity(result["result"]["polarity"])
         subjectivity = sc.categorize_subjectivity(result["result"]["subjectivity"])
@@ -165,7 +172,7 @@ def single_text_analysis_builder(URL: str):
     Args:
         URL (str): The API URL to send requests to.
     """
-    request_handler = RequestHandler(url=URL)
+    request_handler = get_request_handler(URL)
     full_text_result = None
     per_sentence_result = None
 
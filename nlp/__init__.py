@@ -1 +1,22 @@
-from .analyser import SentimentAnalyser
\ No newline at end of file
+from importlib import import_module
+
+# The classes are imported on first access, so "from nlp.metrics import ..." or the
+# ingestion CLI do not pay for TextBlob, NLTK and NumPy before they need them.
+_EXPORTS = {
+    "SentimentAnalyser": ".analyser",
+    "MicroBatcher": ".batching",
+    "BulkAnalyser": ".bulk",
+    "ResultCache": ".cache",
+    "JobQueue": ".jobs",
+    "SentimentSummary": ".summary",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
@@ -1,11 +1,189 @@
-from textblob import TextBlob
+from .backends import create_backend
+from .metrics import STAGE_SECONDS, profiled
+import itertools
 import logging
 
 logger = logging.getLogger("backend")
 
+ANALYSIS_MODES = ("full", "sentence", "confidence")
+# analysis type of the sentence scores in the cache of analyse_sentences
+SENTENCE_SCORE = "sentence_score"
+
+# analyse runs once per text, so it only logs every ROW_LOG_SAMPLE-th text at DEBUG;
+# batch callers log a summary per batch instead.
+ROW_LOG_SAMPLE = 1000
+_analysed_texts = itertools.count()
+
 class SentimentAnalyser:
-    def __init__(self):
-        logger.info("SentimentAnalyser initialized.")
+    def __init__(self, backend: str = "textblob", segmenter: str = "punkt"):
+        """Initialize the analyser.
+
+        Args:
+            backend (str, optional): name of the scoring backend, "textblob" or "lexicon". Defaults to "textblob".
+            segmenter (str, optional): sentence segmenter, "punkt" or the faster rule based "rules". Defaults to "punkt".
+        """
+        self.backend = create_backend(backend, segmenter=segmenter)
+        logger.info("SentimentAnalyser initialized with the %s backend and the %s segmenter.",
+                    self.backend.name, self.backend.segmenter)
+
+    def warm_up(self):
+        """Load everything the backend loads lazily, so the first real request does not pay for it.
+
+        For TextBlob this parses a sample text once, which loads the pattern sentiment
+        lexicon and the NLTK sentence tokenizer.
+        """
+        logger.info("Warming up SentimentAnalyser.")
+        self.backend.warm_up()
+        logger.info("SentimentAnalyser warmed up.")
+
+    def analyse(self, text: str, modes=ANALYSIS_MODES) -> dict:
+        """Analyse a text once and return every requested metric from the same parsed document.
+
+        Args:
+            text (str): string to be analysed
+            modes (tuple, optional): any of "full", "sentence" and "confidence". Defaults to all.
+
+        Returns:
+            dict: one key per requested mode, holding the same values as analyse_text_full,
+                analyse_text_per_sentence and sentiment_confidence_score
+        """
+        with profiled():
+            analysis = self.backend.analyse(text, modes)
+            if next(_analysed_texts) % ROW_LOG_SAMPLE == 0 and logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Analysed a text with modes %s (sampled 1 in %d).", ",".join(modes), ROW_LOG_SAMPLE)
+            return analysis
+
+    def analyse_batch(self, texts, modes=ANALYSIS_MODES) -> dict:
+        """Analyse a batch of texts in one call and return the results column-wise.
+
+        The backend scores the whole batch at once, so per-call overhead, tokenizer
+        setup and logging are paid per batch instead of per text. A text that cannot be
+        analysed does not fail the batch, it is marked in the failed column instead.
+
+        Args:
+            texts (list): strings to be analysed
+            modes (tuple, optional): any of "full", "sentence" and "confidence". Defaults to all.
+
+        Returns:
+            dict: NumPy arrays aligned with texts: polarity and subjectivity for "full",
+                average_polarity, sum_of_polarities, average_subjectivity,
+                sum_of_subjectivities and total_sentences for "sentence", confidence for
+                "confidence", and failed. Failed texts hold NaN (0 for total_sentences
+                and confidence).
+        """
+        texts = texts if isinstance(texts, list) else list(texts)
+        with profiled(), STAGE_SECONDS.time("analyse_batch"):
+            columns = self.backend.score_batch(texts, modes)
+        failed = int(columns["failed"].sum())
+        if failed:
+            logger.warning("Unable to analyse %d of %d texts in the batch.", failed, len(texts))
+        else:
+            logger.debug("Analysed a batch of %d texts with modes %s.", len(texts), ",".join(modes))
+        return columns
+
+    def analyse_iter(self, texts, modes=ANALYSIS_MODES, batch_size: int = 1000):
+        """Analyse texts from any iterable, one batch of columns at a time.
+
+        Only one batch of texts is held at once, so arbitrarily long iterables (file
+        lines, database cursors) can be analysed in constant memory.
+
+        Args:
+            texts (iterable): strings to be analysed
+            modes (tuple, optional): any of "full", "sentence" and "confidence". Defaults to all.
+            batch_size (int, optional): number of texts analysed per batch. Defaults to 1000.
+
+        Yields:
+            dict: the columns of analyse_batch for the next batch_size texts, in input order
+        """
+        iterator = iter(texts)
+        while True:
+            batch = list(itertools.islice(iterator, max(1, batch_size)))
+            if not batch:
+                return
+            yield self.analyse_batch(batch, modes)
+
+    def analyse_sentences(self, text: str, cache=None, include_sentences: bool = False) -> dict:
+        """Analyse a text sentence by sentence, scoring only sentences not seen before.
+
+        Every sentence is scored on its own and its polarity, subjectivity and word
+        counts are kept in the cache under a hash of the sentence. Re-analysing an
+        edited text looks up the unchanged sentences and only scores the new or changed
+        ones, so the cost of an edit does not grow with the length of the document.
+        The sums, averages and the confidence are aggregated from the per-sentence
+        values and equal those of analyse with the "sentence" and "confidence" modes,
+        with every backend.
+
+        Args:
+            text (str): string to be analysed
+            cache (ResultCache, optional): cache of the sentence scores, nothing is memoized if None. Defaults to None.
+            include_sentences (bool, optional): add the score of every sentence to the result. Defaults to False.
+
+        Returns:
+            dict: the "sentence" and "confidence" results of analyse, and with include_sentences
+                a "sentences" list with the text, polarity and subjectivity of each sentence
+        """
+        with profiled():
+            try:
+                with STAGE_SECONDS.time("sentence_split"):
+                    sentences = self.backend.split_sentences(text)
+                scores = self._sentence_scores(sentences, cache)
+            except Exception as e:
+                logger.warning("Warning, unable to analyze text per sentence: %s", e)
+                analysis = self.analyse(text, modes=("sentence", "confidence"))
+                if include_sentences:
+                    analysis["sentences"] = []
+                return analysis
+
+        polarities = 0.0
+        subjectivities = 0.0
+        words = 0
+        sentiment_words = 0
+        for polarity, subjectivity, sentence_words, sentence_sentiment_words in scores:
+            polarities += polarity
+            subjectivities += subjectivity
+            words += sentence_words
+            sentiment_words += sentence_sentiment_words
+        total_sentences = len(sentences)
+        analysis = {
+            "sentence": {
+                "average_polarity": polarities / total_sentences if total_sentences > 0 else 0,
+                "sum_of_polarities": polarities,
+                "average_subjectivity": subjectivities / total_sentences if total_sentences > 0 else 0,
+                "sum_of_subjectivities": subjectivities,
+                "total_sentences": total_sentences,
+            },
+            "confidence": sentiment_words / words if words else 0,
+        }
+        if include_sentences:
+            analysis["sentences"] = [
+                {"text": sentence, "polarity": score[0], "subjectivity": score[1]}
+                for sentence, score in zip(sentences, scores)
+            ]
+        return analysis
+
+    def _sentence_scores(self, sentences: list, cache=None) -> list:
+        """Return [polarity, subjectivity, words, sentiment_words] of every sentence, scoring cache misses only."""
+        if cache is not None:
+            keys = [cache.key(sentence, SENTENCE_SCORE) for sentence in sentences]
+            scores = [cache.get(key) for key in keys]
+        else:
+            scores = [None] * len(sentences)
+        missing = {}
+        for index, score in enumerate(scores):
+            if score is None:
+                missing.setdefault(sentences[index], []).append(index)
+        if missing:
+            with STAGE_SECONDS.time("sentence_polarity"):
+                columns = self.backend.score_sentences(list(missing))
+            for position, indices in enumerate(missing.values()):
+                score = [float(columns["polarity"][position]), float(columns["subjectivity"][position]),
+                         int(columns["words"][position]), int(columns["sentiment_words"][position])]
+                for index in indices:
+                    scores[index] = score
+            if cache is not None:
+                cache.put_many((keys[indices[0]], scores[indices[0]]) for indices in missing.values())
+        logger.debug("Scored %d of %d sentences, the rest came from the cache.", len(missing), len(sentences))
+        return scores
 
     def analyse_text_full(self, text: str) -> dict:
         """analysis full text sentiment with TextBlob
@@ -16,21 +194,7 @@ class SentimentAnalyser:
         Returns:
             dict: returns a dictionary with the polarity and subjectivity of the text
         """
-        try:
-            blob = TextBlob(text)
-            logger.info("Starting full text analysis.")
-            full_text_analysis = {
-                "polarity": blob.sentiment.polarity, #type:ignore
-                "subjectivity": blob.sentiment.subjectivity, #type:ignore
-            }
-            logger.info("Full text analysis completed successfully.")
-        except Exception as e:
-            logger.warning(f"Warning, unable to analyze text: {e}")
-            full_text_analysis = {
-                "polarity": None,
-                "subjectivity": None,
-            }   
-        return full_text_analysis
+        return self.analyse(text, modes=("full",))["full"]
     
     def analyse_text_per_sentence(self, text: str) -> dict:
         """Analyses a test sentence by sentence using TextBlob.
@@ -41,37 +205,7 @@ class SentimentAnalyser:
         Returns:
             dict: returns a dictionary with the average polarity and subjectivity of the text, as well as the sum of polarities and subjectivities, and the total number of sentences.
         """
-        try:
-            logger.info("Starting per sentence text analysis.")
-            blob = TextBlob(text)
-            polarities = 0.0
-            subjectivities = 0.0
-
-            for sentence in blob.sentences: #type: ignore
-                polarities += sentence.sentiment.polarity
-                subjectivities += sentence.sentiment.subjectivity
-            
-            average_polarity = polarities / len(blob.sentences) if len(blob.sentences) > 0 else 0 #type:ignore
-            average_subjectivity = subjectivities / len(blob.sentences) if len(blob.sentences) > 0 else 0 #type:ignore
-
-            per_sentence_analysis = {
-                "average_polarity": average_polarity,
-                "sum_of_polarities": polarities,
-                "average_subjectivity": average_subjectivity,
-                "sum_of_subjectivities": subjectivities,
-                "total_sentences": len(blob.sentences) #type:ignore
-            }
-            logger.info("Per sentence text analysis completed successfully.")
-        except Exception as e:
-            logger.warning(f"Warning, unable to analyze text per sentence: {e}")
-            per_sentence_analysis = {
-                "average_polarity": None,
-                "sum_of_polarities": None,
-                "average_subjectivity": None,
-                "sum_of_subjectivities": None,
-                "total_sentences": 0
-            }
-        return per_sentence_analysis
+        return self.analyse(text, modes=("sentence",))["sentence"]
     
     def sentiment_confidence_score(self, text):
         """Calculate the sentiment confidence score of the text.
@@ -83,9 +217,7 @@ class SentimentAnalyser:
         Returns:
             float: sentiment confidence score 0-1
         """
-        blob = TextBlob(text)
-        sentiment_words = [word for word in blob.words if TextBlob(word).sentiment.polarity != 0] #type: ignore
-        return len(sentiment_words) / len(blob.words) if blob.words else 0 #type: ignore
+        return self.analyse(text, modes=("confidence",))["confidence"]
 
 if __name__ == "__main__":
     print("TextBlob sentiment analysis completed.")
@@ -0,0 +1,40 @@
+from importlib import import_module
+from .base import AnalyserBackend
+from ..segmenter import SEGMENTERS
+
+# backend name -> (module, class), a backend's module and its dependencies are only
+# imported when the backend is created
+BACKENDS = {
+    "textblob": (".blob", "TextBlobBackend"),
+    "lexicon": (".lexicon", "LexiconBackend"),
+}
+_CLASSES = {class_name: module for module, class_name in BACKENDS.values()}
+
+
+def __getattr__(name: str):
+    if name not in _CLASSES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_CLASSES[name], __name__), name)
+
+
+def create_backend(name: str = "textblob", segmenter: str = "punkt") -> AnalyserBackend:
+    """Create the analyser backend registered under a name.
+
+    Args:
+        name (str, optional): "textblob" or "lexicon". Defaults to "textblob".
+        segmenter (str, optional): sentence segmenter, "punkt" (NLTK) or "rules" (nlp.segmenter). Defaults to "punkt".
+
+    Raises:
+        ValueError: if no backend is registered under the name or the segmenter is unknown
+
+    Returns:
+        AnalyserBackend: a new backend instance
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown analyser backend {name!r}, choose one of {', '.join(BACKENDS)}.")
+    if segmenter not in SEGMENTERS:
+        raise ValueError(f"Unknown sentence segmenter {segmenter!r}, choose one of {', '.join(SEGMENTERS)}.")
+    module, class_name = BACKENDS[name]
+    backend = getattr(import_module(module, __name__), class_name)()
+    backend.segmenter = segmenter
+    return backend
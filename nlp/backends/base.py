@@ -0,0 +1,135 @@
+from .. import segmenter as rules
+import math
+import numpy as np
+
+FULL_COLUMNS = ("polarity", "subjectivity")
+SENTENCE_COLUMNS = ("average_polarity", "sum_of_polarities", "average_subjectivity", "sum_of_subjectivities")
+SENTENCE_SCORE_COLUMNS = ("polarity", "subjectivity", "words", "sentiment_words")
+
+
+def empty_columns(size: int, modes) -> dict:
+    """Allocate the result columns of a batch, pre-filled with the values of a failed analysis.
+
+    Args:
+        size (int): number of texts in the batch
+        modes (tuple): any of "full", "sentence" and "confidence"
+
+    Returns:
+        dict: float columns holding NaN, total_sentences and confidence holding 0, and a
+            boolean failed column marking the texts that raised
+    """
+    columns = {"failed": np.zeros(size, dtype=bool)}
+    if "full" in modes:
+        for name in FULL_COLUMNS:
+            columns[name] = np.full(size, np.nan)
+    if "sentence" in modes:
+        for name in SENTENCE_COLUMNS:
+            columns[name] = np.full(size, np.nan)
+        columns["total_sentences"] = np.zeros(size, dtype=np.int64)
+    if "confidence" in modes:
+        columns["confidence"] = np.zeros(size)
+    return columns
+
+
+def _value(value):
+    value = float(value)
+    return None if math.isnan(value) else value
+
+
+def result_at(columns: dict, index: int, modes) -> dict:
+    """Convert one row of result columns into the per-text result of SentimentAnalyser.analyse.
+
+    Args:
+        columns (dict): result columns of a batch
+        index (int): position of the text in the batch
+        modes (tuple): any of "full", "sentence" and "confidence"
+
+    Returns:
+        dict: one key per requested mode, failed values are None
+    """
+    analysis = {}
+    if "full" in modes:
+        analysis["full"] = {name: _value(columns[name][index]) for name in FULL_COLUMNS}
+    if "sentence" in modes:
+        analysis["sentence"] = {name: _value(columns[name][index]) for name in SENTENCE_COLUMNS}
+        analysis["sentence"]["total_sentences"] = int(columns["total_sentences"][index])
+    if "confidence" in modes:
+        analysis["confidence"] = float(columns["confidence"][index])
+    return analysis
+
+
+class AnalyserBackend:
+    """Scoring engine behind SentimentAnalyser.
+
+    A backend scores texts either one at a time with analyse, returning the nested
+    result dictionary of SentimentAnalyser.analyse, or a whole batch at once with
+    score_batch, returning one NumPy column per metric. Each method has a default in
+    terms of the other, so a backend implements whichever fits its engine.
+    """
+    name = ""
+    # sentence segmenter of split_sentences, one of segmenter.SEGMENTERS
+    segmenter = "punkt"
+
+    def warm_up(self):
+        """Load whatever the backend loads lazily."""
+        self.analyse("This warms up the analyser. It is a good idea!", ("full", "sentence", "confidence"))
+
+    def analyse(self, text: str, modes) -> dict:
+        """Analyse a single text.
+
+        Args:
+            text (str): string to be analysed
+            modes (tuple): any of "full", "sentence" and "confidence"
+
+        Returns:
+            dict: one key per requested mode, see SentimentAnalyser.analyse
+        """
+        return result_at(self.score_batch([text], modes), 0, modes)
+
+    def score_batch(self, texts: list, modes) -> dict:
+        """Analyse a batch of texts into result columns.
+
+        Args:
+            texts (list): strings to be analysed
+            modes (tuple): any of "full", "sentence" and "confidence"
+
+        Returns:
+            dict: polarity and subjectivity for "full", the averages, sums and
+                total_sentences for "sentence" and confidence, each an array aligned
+                with texts. Texts that could not be analysed hold NaN (0 for
+                total_sentences and confidence) and are marked in the failed column.
+        """
+        columns = empty_columns(len(texts), modes)
+        for index, text in enumerate(texts):
+            self._write_row(columns, index, self.analyse(text, modes))
+        return columns
+
+    def split_sentences(self, text: str) -> list:
+        """Split a text into the sentences the "sentence" mode scores, with NLTK's Punkt or the rule based segmenter."""
+        if self.segmenter == "rules":
+            return rules.split_sentences(text)
+        from textblob.tokenizers import sent_tokenize
+
+        return list(sent_tokenize(text))
+
+    def score_sentences(self, sentences: list) -> dict:
+        """Score sentences on their own, the parts SentimentAnalyser.analyse_sentences caches.
+
+        Args:
+            sentences (list): sentences as returned by split_sentences
+
+        Returns:
+            dict: polarity, subjectivity, words and sentiment_words, each an array aligned
+                with sentences. words and sentiment_words are the denominator and numerator
+                of the confidence score, so the confidence of a text follows from their sums.
+        """
+        raise NotImplementedError(f"the {self.name} backend cannot score single sentences")
+
+    @staticmethod
+    def _write_row(columns: dict, index: int, analysis: dict):
+        """Write the per-text result of analyse into row index of the result columns."""
+        for mode in ("full", "sentence"):
+            for name, value in analysis.get(mode, {}).items():
+                columns[name][index] = np.nan if value is None else value
+        if "confidence" in analysis:
+            columns["confidence"][index] = analysis["confidence"]
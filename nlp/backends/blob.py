@@ -0,0 +1,184 @@
+from textblob import TextBlob
+from textblob.en import sentiment as pattern_sentiment
+from textblob.tokenizers import WordTokenizer
+from textblob.utils import strip_punc
+from nltk.tokenize import word_tokenize
+from ..confidence import ConfidenceScorer
+from ..metrics import STAGE_SECONDS
+from .base import AnalyserBackend, empty_columns
+import numpy as np
+import logging
+
+logger = logging.getLogger("backend")
+
+
+class TextBlobBackend(AnalyserBackend):
+    """Scores texts with TextBlob's PatternAnalyzer, the reference results of the API."""
+    name = "textblob"
+
+    def __init__(self):
+        self.confidence_scorer = ConfidenceScorer()
+        self.word_tokenizer = WordTokenizer()
+
+    def analyse(self, text: str, modes) -> dict:
+        """Analyse a text once and return every requested metric from the same parsed document.
+
+        The text is wrapped in a single TextBlob and split into sentences once. The word
+        tokens used for the confidence score are taken from those sentences, which is the
+        same tokenization TextBlob.words would produce, so nothing is parsed twice.
+        """
+        blob = None
+        sentences = None
+        analysis = {}
+        try:
+            blob = TextBlob(text)
+            if "sentence" in modes or "confidence" in modes:
+                with STAGE_SECONDS.time("sentence_split"):
+                    sentences = self.split_sentences(blob.raw)
+        except Exception as e:
+            logger.warning("Warning, unable to parse text: %s", e)
+
+        if "full" in modes:
+            with STAGE_SECONDS.time("polarity"):
+                analysis["full"] = self._full_result(blob)
+
+        if "sentence" in modes:
+            with STAGE_SECONDS.time("sentence_polarity"):
+                analysis["sentence"] = self._per_sentence_result(blob, sentences)
+
+        if "confidence" in modes:
+            if sentences is None:
+                analysis["confidence"] = 0
+            else:
+                with STAGE_SECONDS.time("tokenization"):
+                    words = [word for sentence in sentences for word in self._words(sentence)]
+                with STAGE_SECONDS.time("confidence"):
+                    analysis["confidence"] = self.confidence_scorer.score(words)
+        return analysis
+
+    def score_batch(self, texts: list, modes) -> dict:
+        """Analyse a batch of texts into result columns, see AnalyserBackend.score_batch.
+
+        Texts are scored with the pattern scorer TextBlob's PatternAnalyzer wraps, without
+        building a TextBlob per text. The loop runs inside a single try block: a text that
+        raises is marked as failed, analysed again on its own through analyse, which
+        keeps whatever parts of it can be analysed, and the loop resumes after it.
+        """
+        columns = empty_columns(len(texts), modes)
+        position = 0
+        while position < len(texts):
+            try:
+                for position in range(position, len(texts)):
+                    self._score_into(columns, position, texts[position], modes)
+                break
+            except Exception as e:
+                logger.warning("Warning, unable to analyze text %d of the batch: %s", position, e)
+                columns["failed"][position] = True
+                self._write_row(columns, position, self.analyse(texts[position], modes))
+                position += 1
+        return columns
+
+    def _score_into(self, columns: dict, index: int, text: str, modes):
+        """Score one text of a batch straight into the result columns."""
+        if not isinstance(text, str):
+            raise TypeError(f"expected a string, got {type(text).__name__}")
+        if "full" in modes:
+            columns["polarity"][index], columns["subjectivity"][index] = pattern_sentiment(text)
+        if "sentence" in modes or "confidence" in modes:
+            sentences = self.split_sentences(text)
+            if "sentence" in modes:
+                polarities = 0.0
+                subjectivities = 0.0
+                for sentence in sentences:
+                    polarity, subjectivity = pattern_sentiment(sentence)
+                    polarities += polarity
+                    subjectivities += subjectivity
+                total_sentences = len(sentences)
+                columns["sum_of_polarities"][index] = polarities
+                columns["sum_of_subjectivities"][index] = subjectivities
+                columns["average_polarity"][index] = polarities / total_sentences if total_sentences > 0 else 0
+                columns["average_subjectivity"][index] = subjectivities / total_sentences if total_sentences > 0 else 0
+                columns["total_sentences"][index] = total_sentences
+            if "confidence" in modes:
+                columns["confidence"][index] = self.confidence_scorer.score(
+                    [word for sentence in sentences for word in self._words(sentence)])
+
+    def score_sentences(self, sentences: list) -> dict:
+        """Score sentences on their own, see AnalyserBackend.score_sentences."""
+        scores = {
+            "polarity": np.zeros(len(sentences)),
+            "subjectivity": np.zeros(len(sentences)),
+            "words": np.zeros(len(sentences), dtype=np.int64),
+            "sentiment_words": np.zeros(len(sentences), dtype=np.int64),
+        }
+        for index, sentence in enumerate(sentences):
+            scores["polarity"][index], scores["subjectivity"][index] = pattern_sentiment(sentence)
+            words = self._words(sentence)
+            scores["words"][index] = len(words)
+            scores["sentiment_words"][index] = self.confidence_scorer.count_sentiment_words(words)
+        return scores
+
+    def _words(self, sentence: str) -> list:
+        """Return the words of a sentence without punctuation, as TextBlob.words has them.
+
+        TextBlob's WordTokenizer splits its input with Punkt once more before it
+        tokenizes the words. Sentences of the rule based segmenter are tokenized as
+        they are, so that segmenter needs no Punkt model at all.
+        """
+        if self.segmenter != "rules":
+            return self.word_tokenizer.tokenize(sentence, include_punc=False)
+        return [word if word.startswith("'") else strip_punc(word, all=False)
+                for word in word_tokenize(sentence, preserve_line=True) if strip_punc(word, all=False)]
+
+    def _full_result(self, blob) -> dict:
+        """Build the full text result from an already parsed blob."""
+        try:
+            if blob is None:
+                raise ValueError("text could not be parsed")
+            sentiment = blob.sentiment
+            full_text_analysis = {
+                "polarity": sentiment.polarity, #type:ignore
+                "subjectivity": sentiment.subjectivity, #type:ignore
+            }
+        except Exception as e:
+            logger.warning("Warning, unable to analyze text: %s", e)
+            full_text_analysis = {
+                "polarity": None,
+                "subjectivity": None,
+            }
+        return full_text_analysis
+
+    def _per_sentence_result(self, blob, sentences) -> dict:
+        """Build the per sentence result from already split sentences of the blob."""
+        try:
+            if blob is None or sentences is None:
+                raise ValueError("text could not be split into sentences")
+            polarities = 0.0
+            subjectivities = 0.0
+
+            for sentence in sentences:
+                sentiment = blob.analyzer.analyze(sentence)
+                polarities += sentiment.polarity #type:ignore
+                subjectivities += sentiment.subjectivity #type:ignore
+
+            total_sentences = len(sentences)
+            average_polarity = polarities / total_sentences if total_sentences > 0 else 0
+            average_subjectivity = subjectivities / total_sentences if total_sentences > 0 else 0
+
+            per_sentence_analysis = {
+                "average_polarity": average_polarity,
+                "sum_of_polarities": polarities,
+                "average_subjectivity": average_subjectivity,
+                "sum_of_subjectivities": subjectivities,
+                "total_sentences": total_sentences
+            }
+        except Exception as e:
+            logger.warning("Warning, unable to analyze text per sentence: %s", e)
+            per_sentence_analysis = {
+                "average_polarity": None,
+                "sum_of_polarities": None,
+                "average_subjectivity": None,
+                "sum_of_subjectivities": None,
+                "total_sentences": 0
+            }
+        return per_sentence_analysis
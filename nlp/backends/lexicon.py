@@ -0,0 +1,335 @@
+from itertools import chain
+from textblob.en import sentiment as pattern_sentiment
+from textblob._text import ABBREVIATIONS, EMOTICONS, PUNCTUATION
+from ..confidence import ConfidenceScorer
+from ..metrics import STAGE_SECONDS
+from .base import AnalyserBackend, empty_columns
+import numpy as np
+import logging
+import re
+
+logger = logging.getLogger("backend")
+
+NEGATIONS = ("no", "not", "never")
+CONTRACTION = ("n", "'", "t")
+
+# pattern's tokenizer, ported to work on lowercased text: quotes and the apostrophe of
+# contractions become tokens of their own, punctuation is split off the start and the
+# end of whitespace separated chunks and a final period is kept on abbreviations.
+_LEADING = tuple(set(PUNCTUATION) - {"."})
+_TRAILING = _LEADING + (".",)
+_ABBREVIATIONS = {abbreviation.lower() for abbreviation in ABBREVIATIONS}
+_ABBREVIATION = re.compile(r"^([a-z]\.)+$")
+_QUOTES = str.maketrans({quote: f" {quote} " for quote in "'\"“”‘’"})
+_WORD = re.compile(r"\w[\w-]*")
+# pattern glues emoticons back together after splitting off their punctuation
+_EMOTICON_SCORES = {emoticon.lower(): polarity for (_, polarity), emoticons in EMOTICONS.items()
+                    for emoticon in emoticons if not emoticon.isalpha()}
+_EMOTICON = re.compile(r"(?:^|(?<=[^\w\s]))(%s)$" % "|".join(
+    map(re.escape, sorted(_EMOTICON_SCORES, key=len, reverse=True))))
+
+
+def _tokenize(text: str) -> list:
+    """Split a text into the lowercased tokens pattern's scorer sees."""
+    tokens = []
+    for chunk in text.lower().replace("n't", " n't").translate(_QUOTES).split():
+        if chunk.isalnum():
+            tokens.append(chunk)
+            continue
+        if chunk == "(!)" or chunk in _EMOTICON_SCORES:
+            tokens.append(chunk)
+            continue
+        emoticon = _EMOTICON.search(chunk)
+        if emoticon is not None:
+            chunk = chunk[:emoticon.start()]
+        while chunk.startswith(_LEADING):
+            tokens.append(chunk[0])
+            chunk = chunk[1:]
+        tail = []
+        while chunk.endswith(_TRAILING):
+            if chunk.endswith(_LEADING):
+                tail.append(chunk[-1])
+                chunk = chunk[:-1]
+            if chunk.endswith("..."):
+                tail.append("...")
+                chunk = chunk[:-3].rstrip(".")
+            if chunk.endswith("."):
+                if chunk in _ABBREVIATIONS or _ABBREVIATION.match(chunk) is not None:
+                    break
+                tail.append(".")
+                chunk = chunk[:-1]
+        if chunk:
+            tokens.append(chunk)
+        tokens.extend(reversed(tail))
+        if emoticon is not None:
+            tokens.append(emoticon.group(1))
+    return tokens
+
+
+class _CompiledLexicon:
+    """The pattern sentiment lexicon compiled into a vocabulary hash and per-token arrays.
+
+    Every token id indexes the arrays below. Lexicon forms come first, followed by the
+    emoticons and the irony marker pattern scores on their own, and by the negations
+    and punctuation the scoring rules look at. The last id stands for unknown tokens.
+    """
+    def __init__(self):
+        if dict.__len__(pattern_sentiment) == 0:
+            pattern_sentiment.load()
+        confidence_index = ConfidenceScorer()._index
+        forms = [form for form in dict.keys(pattern_sentiment) if " " not in form]
+        # pattern only scores emoticons that are not alphabetic ("xD" is not)
+        extras = dict(_EMOTICON_SCORES)
+        extras["(!)"] = 0.0
+        specials = [token for token in NEGATIONS + ("!",) + CONTRACTION
+                    if token not in extras and token not in pattern_sentiment]
+
+        tokens = forms + list(extras) + specials
+        self.vocabulary = {token: index for index, token in enumerate(tokens)}
+        self.unknown = len(tokens)
+        size = len(tokens) + 1
+
+        self.polarity = np.zeros(size)
+        self.subjectivity = np.zeros(size)
+        self.intensity = np.ones(size)
+        self.known = np.zeros(size, dtype=bool)
+        self.extra = np.zeros(size, dtype=bool)
+        self.modifier = np.zeros(size, dtype=bool)
+        self.ly_modifier = np.zeros(size, dtype=bool)
+        self.sentiment_word = np.zeros(size, dtype=bool)
+        for index, form in enumerate(forms):
+            polarity, subjectivity, intensity = pattern_sentiment[form][None]
+            self.polarity[index] = polarity
+            self.subjectivity[index] = subjectivity
+            self.intensity[index] = intensity
+            self.known[index] = True
+            self.modifier[index] = "RB" in pattern_sentiment[form]
+            self.ly_modifier[index] = self.modifier[index] and form.endswith("ly")
+            self.sentiment_word[index] = confidence_index.get(form, 0.0) != 0 #type: ignore
+        for token, polarity in extras.items():
+            index = self.vocabulary[token]
+            self.polarity[index] = polarity
+            self.subjectivity[index] = 1.0
+            self.extra[index] = True
+
+        self.negation = self._flags(size, NEGATIONS)
+        self.exclamation = self._flags(size, ("!",))
+
+    def _flags(self, size: int, tokens) -> np.ndarray:
+        flags = np.zeros(size, dtype=bool)
+        flags[[self.vocabulary[token] for token in tokens if token in self.vocabulary]] = True
+        return flags
+
+
+def _previous(marks: np.ndarray, first: np.ndarray) -> np.ndarray:
+    """Index of the closest marked token before each token within its segment, -1 if none.
+
+    Args:
+        marks (ndarray): boolean mask of the tokens that can be found
+        first (ndarray): index of the first token of the segment of each token
+
+    Returns:
+        ndarray: index per token
+    """
+    found = np.maximum.accumulate(np.where(marks, np.arange(len(marks)), -1))
+    previous = np.empty_like(found)
+    previous[:1] = -1
+    previous[1:] = found[:-1]
+    previous[previous < first] = -1
+    return previous
+
+
+class LexiconBackend(AnalyserBackend):
+    """Scores batches of texts with the pattern lexicon compiled into NumPy arrays.
+
+    Texts are tokenized with one regular expression, mapped to token ids through a
+    vocabulary hash and scored for the whole batch at once. The rules of pattern's
+    scorer are evaluated as array operations: a known word after an intensifying
+    adverb merges into one assessment with the scaled score, a negation ("no",
+    "not", "never") flips and halves the score of the next known word across one
+    letter tokens, exclamation marks boost the previous assessment by 1.25 and
+    emoticons and "(!)" count as assessments of their own. A text scores the mean
+    of its assessments.
+
+    The tokenizer is a port of pattern's and the sentences are the ones of
+    split_sentences, so the configured segmenter applies. With the sentence mode the
+    words of the confidence score are counted per sentence, as analyse_sentences counts
+    them. Only this word count approximates NLTK's, so results are close to but not always
+    equal with the TextBlob backend. benchmarks/backend_parity.py checks the tolerance
+    on the bundled test data: every column but the confidence is within 0.05 of
+    TextBlob for at least 99% of the texts (measured 99.7%), the confidence for at
+    least 95% (measured 97.5%). Scoring a batch is about 13 times faster than TextBlob,
+    6 times with the sentence mode, which spends most of its time in the sentence split.
+    """
+    name = "lexicon"
+    _lexicon = None
+
+    def __init__(self):
+        if LexiconBackend._lexicon is None:
+            LexiconBackend._lexicon = _CompiledLexicon()
+            logger.info("Compiled sentiment lexicon with %d tokens.", LexiconBackend._lexicon.unknown)
+        self.lexicon = LexiconBackend._lexicon
+
+    def warm_up(self):
+        """The lexicon is compiled on creation, score a text once for good measure."""
+        self.score_batch(["This warms up the analyser. It is a good idea!"], ("full", "sentence", "confidence"))
+
+    def score_batch(self, texts: list, modes) -> dict:
+        """Analyse a batch of texts into result columns, see AnalyserBackend.score_batch."""
+        columns = empty_columns(len(texts), modes)
+        valid = np.fromiter((isinstance(text, str) for text in texts), dtype=bool, count=len(texts))
+        columns["failed"][:] = ~valid
+        if not valid.all():
+            logger.warning("Warning, unable to analyze %d texts that are not strings.", int((~valid).sum()))
+
+        tokens, ids, lengths, documents = self._encode(texts, valid)
+        with STAGE_SECONDS.time("lexicon_scoring"):
+            if "full" in modes:
+                polarity, subjectivity, _ = self._score_segments(ids, lengths, documents, len(texts))
+                columns["polarity"][valid] = polarity[valid]
+                columns["subjectivity"][valid] = subjectivity[valid]
+
+            if "sentence" in modes:
+                # the sentences of split_sentences, so the segmenter setting applies and the
+                # sentences are the ones TextBlob and analyse_sentences score
+                with STAGE_SECONDS.time("sentence_split"):
+                    sentence_lists = [self.split_sentences(text) if ok else [] for text, ok in zip(texts, valid)]
+                sentences = list(chain.from_iterable(sentence_lists))
+                total = np.fromiter(map(len, sentence_lists), dtype=np.int64, count=len(texts))
+                sentence_documents = np.repeat(np.arange(len(texts)), total)
+                sentence_tokens, sentence_ids, sentence_lengths, segments = self._encode(
+                    sentences, np.ones(len(sentences), dtype=bool))
+                polarity, subjectivity, _ = self._score_segments(sentence_ids, sentence_lengths, segments, len(sentences))
+                polarities = np.bincount(sentence_documents, weights=polarity, minlength=len(texts))
+                subjectivities = np.bincount(sentence_documents, weights=subjectivity, minlength=len(texts))
+                divisor = np.maximum(total, 1)
+                columns["sum_of_polarities"][valid] = polarities[valid]
+                columns["sum_of_subjectivities"][valid] = subjectivities[valid]
+                columns["average_polarity"][valid] = (polarities / divisor)[valid]
+                columns["average_subjectivity"][valid] = (subjectivities / divisor)[valid]
+                columns["total_sentences"][:] = total
+
+            if "confidence" in modes:
+                if "sentence" in modes:
+                    # words counted per sentence like TextBlob and analyse_sentences count them,
+                    # which differs from the whole text where a sentence ends inside a chunk ("out!!poor")
+                    total_words, sentiment_words = self._word_counts(
+                        sentence_tokens, sentence_ids, sentence_documents[segments], len(texts))
+                else:
+                    total_words, sentiment_words = self._word_counts(tokens, ids, documents, len(texts))
+                columns["confidence"][:] = sentiment_words / np.maximum(total_words, 1)
+        return columns
+
+    def score_sentences(self, sentences: list) -> dict:
+        """Score sentences on their own, see AnalyserBackend.score_sentences."""
+        valid = np.ones(len(sentences), dtype=bool)
+        tokens, ids, lengths, documents = self._encode(sentences, valid)
+        with STAGE_SECONDS.time("lexicon_scoring"):
+            polarity, subjectivity, _ = self._score_segments(ids, lengths, documents, len(sentences))
+            words, sentiment_words = self._word_counts(tokens, ids, documents, len(sentences))
+        return {"polarity": polarity, "subjectivity": subjectivity,
+                "words": words.astype(np.int64), "sentiment_words": sentiment_words}
+
+    def _encode(self, texts: list, valid: np.ndarray):
+        """Tokenize a batch of texts into token ids.
+
+        Returns:
+            tuple: the tokens, their ids and lengths and the index of the text of every token
+        """
+        with STAGE_SECONDS.time("lexicon_tokenization"):
+            token_lists = [_tokenize(text) if ok else [] for text, ok in zip(texts, valid)]
+            counts = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+            tokens = list(chain.from_iterable(token_lists))
+            get = self.lexicon.vocabulary.get
+            unknown = self.lexicon.unknown
+            ids = np.fromiter((get(token, unknown) for token in tokens), dtype=np.int64, count=len(tokens))
+            lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+        return tokens, ids, lengths, np.repeat(np.arange(len(texts)), counts)
+
+    def _word_counts(self, tokens: list, ids: np.ndarray, documents: np.ndarray, size: int):
+        """Count the words and the sentiment words of every text, as TextBlob counts them for the confidence."""
+        lexicon = self.lexicon
+        # TextBlob splits words on inner punctuation ("that`s", "later...bye") pattern keeps
+        words = np.fromiter((1 if token.isalnum() else len(_WORD.findall(token)) for token in tokens),
+                            dtype=np.int64, count=len(tokens))
+        # and counts "n't" as one word where pattern has "n ' t"
+        n, apostrophe, t = (lexicon.vocabulary[token] for token in CONTRACTION)
+        words[:-2][(ids[:-2] == n) & (ids[1:-1] == apostrophe) & (ids[2:] == t)] = 0
+        total_words = np.bincount(documents, weights=words, minlength=size)
+        sentiment_words = np.bincount(documents[lexicon.sentiment_word[ids]], minlength=size)
+        return total_words, sentiment_words
+
+    def _score_segments(self, ids: np.ndarray, lengths: np.ndarray, segments: np.ndarray, size: int):
+        """Score every segment (text or sentence) of a batch of token ids like pattern's scorer.
+
+        Args:
+            ids (ndarray): token id per token of the batch
+            lengths (ndarray): number of characters per token
+            segments (ndarray): non-decreasing segment index per token
+            size (int): number of segments
+
+        Returns:
+            tuple: polarity, subjectivity and number of assessments per segment
+        """
+        lexicon = self.lexicon
+        positions = np.arange(len(ids))
+        starts = np.ones(len(ids), dtype=bool)
+        starts[1:] = segments[1:] != segments[:-1]
+        first = np.maximum.accumulate(np.where(starts, positions, 0))
+
+        known = lexicon.known[ids]
+        extra = lexicon.extra[ids]
+        negation = lexicon.negation[ids] & ~known
+
+        # modifiers carry over unknown tokens of up to two characters ("really is a good")
+        previous = _previous(known | (lengths > 2), first)
+        has_previous = previous >= 0
+        previous_ids = ids[np.where(has_previous, previous, 0)]
+        # a negation right after an -ly adverb negates the adverb instead ("really not good")
+        absorbed = negation & has_previous & lexicon.ly_modifier[previous_ids] & known[np.where(has_previous, previous, 0)]
+        previous = _previous(known | ((lengths > 2) & ~absorbed), first)
+        has_previous = previous >= 0
+        safe_previous = np.where(has_previous, previous, 0)
+        modified = known & has_previous & known[safe_previous] & lexicon.modifier[ids[safe_previous]]
+
+        # negations carry over unknown one character tokens ("not a good", "isn ' t good")
+        previous_negation = _previous(known | negation | (lengths > 1), first)
+        safe_negation = np.where(previous_negation >= 0, previous_negation, 0)
+        negated = known & (previous_negation >= 0) & negation[safe_negation] & ~absorbed[safe_negation]
+
+        intensity = lexicon.intensity[ids]
+        intensity = np.where(negated, 1.0 / intensity, intensity)
+        scale = np.where(modified, intensity[safe_previous], 1.0)
+        polarity = np.clip(lexicon.polarity[ids] * scale, -1.0, 1.0)
+        subjectivity = np.clip(lexicon.subjectivity[ids] * scale, -1.0, 1.0)
+
+        # a merged chain of words forms one assessment, owned by its first word
+        owner = np.where(modified, safe_previous, positions)
+        while True:
+            followed = owner[owner]
+            if np.array_equal(followed, owner):
+                break
+            owner = followed
+        assessed = known | extra
+        last = np.full(len(ids), -1)
+        np.maximum.at(last, owner[assessed], positions[assessed])
+        chain_negated = np.zeros(len(ids), dtype=bool)
+        np.logical_or.at(chain_negated, owner[known], negated[known])
+        chain_negated[owner[previous[absorbed]]] = True
+
+        exclamation = lexicon.exclamation[ids]
+        boosted = _previous(assessed, first)[exclamation]
+        boosts = np.bincount(boosted[boosted >= 0], minlength=len(ids))
+        polarity = np.clip(polarity * 1.25 ** boosts, -1.0, 1.0)
+
+        heads = np.flatnonzero(assessed & (owner == positions))
+        tails = last[heads]
+        head_polarity = np.where(chain_negated[heads], polarity[tails] * -0.5, polarity[tails])
+        head_segments = segments[heads]
+        count = np.bincount(head_segments, minlength=size)
+        divisor = np.maximum(count, 1)
+        return (
+            np.bincount(head_segments, weights=head_polarity, minlength=size) / divisor,
+            np.bincount(head_segments, weights=subjectivity[tails], minlength=size) / divisor,
+            count,
+        )
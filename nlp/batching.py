@@ -0,0 +1,99 @@
+from concurrent.futures import Future
+from .backends.base import result_at
+from .metrics import MICRO_BATCH_SIZE, MICRO_BATCH_WAIT_SECONDS
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger("backend")
+
+
+class MicroBatcher:
+    """Collects concurrent single-text analyses into batches for SentimentAnalyser.analyse_batch.
+
+    Callers block in analyse while a background thread takes their texts from a queue,
+    analyses them together and hands every caller its own result. Texts that queue up
+    while a batch is being analysed form the next batch without any waiting. On top of
+    that the thread waits up to max_wait for more texts, but only while recent batches
+    held more than one text, so a single client at low traffic pays no extra latency.
+    """
+    def __init__(self, analyser, max_batch_size: int = 64, max_wait: float = 0.005):
+        """Initialize the batcher and start its thread.
+
+        Args:
+            analyser (SentimentAnalyser): analyser the batches are processed with
+            max_batch_size (int, optional): maximum number of texts per batch. Defaults to 64.
+            max_wait (float, optional): seconds to wait for more texts under concurrent load. Defaults to 0.005.
+        """
+        self.analyser = analyser
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait)
+        # moving average of the batch sizes, the batcher only waits while it is above 1
+        self._load = 1.0
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+        logger.info("MicroBatcher started with batch size %d and max wait %.1f ms.",
+                    self.max_batch_size, self.max_wait * 1000)
+
+    def analyse(self, text: str, modes) -> dict:
+        """Analyse a text as part of the next batch, see SentimentAnalyser.analyse.
+
+        Args:
+            text (str): string to be analysed
+            modes (tuple): any of "full", "sentence" and "confidence"
+
+        Returns:
+            dict: one key per requested mode, like SentimentAnalyser.analyse
+        """
+        future = Future()
+        self._queue.put((text, tuple(modes), future, time.perf_counter()))
+        return future.result()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.perf_counter() + (self.max_wait if self._load > 1.5 else 0.0)
+            stopping = False
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.perf_counter()
+                try:
+                    item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._load = 0.8 * self._load + 0.2 * len(batch)
+            self._process(batch)
+            if stopping:
+                return
+
+    def _process(self, batch: list):
+        """Analyse a batch, one analyse_batch call per combination of modes, and resolve the futures."""
+        start = time.perf_counter()
+        MICRO_BATCH_SIZE.observe(len(batch))
+        groups = {}
+        for text, modes, future, queued in batch:
+            MICRO_BATCH_WAIT_SECONDS.observe(start - queued)
+            groups.setdefault(modes, []).append((text, future))
+        for modes, items in groups.items():
+            try:
+                columns = self.analyser.analyse_batch([text for text, _ in items], modes)
+            except Exception as e:
+                logger.error("Micro batch of %d texts failed: %s", len(items), e)
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            for index, (_, future) in enumerate(items):
+                future.set_result(result_at(columns, index, modes))
+
+    def shutdown(self):
+        """Analyse the texts still queued and stop the thread."""
+        self._queue.put(None)
+        self._thread.join()
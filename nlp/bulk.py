@@ -0,0 +1,203 @@
+from concurrent.futures import ProcessPoolExecutor
+from .analyser import SentimentAnalyser
+from .metrics import BATCH_SIZE, STAGE_SECONDS, profiled
+from .summary import SentimentSummary
+import logging
+import os
+
+logger = logging.getLogger("backend")
+
+_worker_analyser = None
+
+def _init_worker(backend: str = "textblob", segmenter: str = "punkt"):
+    """Create and warm up the analyser of a pool worker once."""
+    global _worker_analyser
+    _worker_analyser = SentimentAnalyser(backend=backend, segmenter=segmenter)
+    _worker_analyser.warm_up()
+
+def _worker_ready(_) -> bool:
+    return _worker_analyser is not None
+
+def _analyse_chunk(texts: list) -> list:
+    """Analyse one chunk of texts inside a pool worker.
+
+    Args:
+        texts (list): texts of the chunk
+
+    Returns:
+        list: (full text result, confidence) tuple per text, in input order
+    """
+    return _score_with(_worker_analyser, texts)
+
+def _summarise_chunk(texts: list) -> SentimentSummary:
+    """Analyse one chunk of texts inside a pool worker and return only their summary."""
+    return _summarise_with(_worker_analyser, texts)
+
+def _summarise_with(analyser, texts: list) -> SentimentSummary:
+    columns = analyser.analyse_batch(texts, modes=("full", "confidence"))
+    return SentimentSummary().add(columns["polarity"], columns["subjectivity"], columns["confidence"])
+
+def _score_with(analyser, texts: list) -> list:
+    """Score texts as one batch with analyse_batch of the analyser.
+
+    Returns:
+        list: (full text result, confidence) tuple per text, in input order
+    """
+    columns = analyser.analyse_batch(texts, modes=("full", "confidence"))
+    return [
+        ({"polarity": None if polarity != polarity else polarity,
+          "subjectivity": None if subjectivity != subjectivity else subjectivity}, confidence)
+        for polarity, subjectivity, confidence in zip(
+            columns["polarity"].tolist(), columns["subjectivity"].tolist(), columns["confidence"].tolist())
+    ]
+
+
+class BulkAnalyser:
+    """Analyses batches of texts in chunks on a long-lived process pool."""
+    def __init__(self, workers: int = 0, chunk_size: int = 250, analyser=None, backend: str = "textblob",
+                 segmenter: str = "punkt"):
+        """Initialize the bulk analyser.
+
+        Args:
+            workers (int, optional): number of worker processes, 0 uses all cores. Defaults to 0.
+            chunk_size (int, optional): number of texts sent to a worker at once. Defaults to 250.
+            analyser (SentimentAnalyser, optional): analyser used for batches analysed in-process. Defaults to None.
+            backend (str, optional): analyser backend of the workers, the backend of analyser if given. Defaults to "textblob".
+            segmenter (str, optional): sentence segmenter of the workers, the one of analyser if given. Defaults to "punkt".
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = max(1, chunk_size)
+        self.backend = analyser.backend.name if analyser is not None else backend
+        self.segmenter = analyser.backend.segmenter if analyser is not None else segmenter
+        self._pool = None
+        self._analyser = analyser
+        logger.info("BulkAnalyser initialized with %d workers, chunk size %d and the %s backend.",
+                    self.workers, self.chunk_size, self.backend)
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """The worker pool, started on first use."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(self.backend, self.segmenter))
+        return self._pool
+
+    def analyse(self, texts: list, cache=None) -> list:
+        """Analyse a batch of texts, keeping the input order.
+
+        With a cache, duplicate texts within the batch are analysed once and texts
+        already in the cache are not analysed at all.
+
+        Args:
+            texts (list): texts to be analysed
+            cache (ResultCache, optional): cache consulted and filled with the results. Defaults to None.
+
+        Returns:
+            list: a dictionary with text, full text result and confidence per text
+        """
+        return [
+            {"text": text, "result": result, "confidence": confidence}
+            for text, (result, confidence) in zip(texts, self._resolve(texts, cache))
+        ]
+
+    def analyse_columns(self, texts: list, cache=None) -> dict:
+        """Analyse a batch of texts and return the numeric results column-wise.
+
+        Args:
+            texts (list): texts to be analysed
+            cache (ResultCache, optional): cache consulted and filled with the results. Defaults to None.
+
+        Returns:
+            dict: "polarity", "subjectivity" and "confidence" lists aligned with texts
+        """
+        scored = self._resolve(texts, cache)
+        return {
+            "polarity": [result["polarity"] for result, _ in scored],
+            "subjectivity": [result["subjectivity"] for result, _ in scored],
+            "confidence": [confidence for _, confidence in scored],
+        }
+
+    def _resolve(self, texts: list, cache=None) -> list:
+        """Return the (full text result, confidence) of every text, using the cache if given."""
+        BATCH_SIZE.observe(len(texts))
+        with profiled(), STAGE_SECONDS.time("bulk_batch"):
+            if cache is None:
+                return self._score(texts)
+
+            keys = [cache.key(text, "full") for text in texts]
+            known = {}
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key in known or key in missing:
+                    continue
+                cached = cache.get(key)
+                if cached is None:
+                    missing[key] = text
+                else:
+                    known[key] = cached
+            if missing:
+                fresh = [
+                    {"result": result, "confidence": confidence}
+                    for result, confidence in self._score(list(missing.values()))
+                ]
+                cache.put_many(zip(missing.keys(), fresh))
+                known.update(zip(missing.keys(), fresh))
+            logger.info("Bulk batch of %d texts needed %d analyses.", len(texts), len(missing))
+            return [(known[key]["result"], known[key]["confidence"]) for key in keys]
+
+    def summarise(self, texts: list, summary: SentimentSummary = None) -> SentimentSummary:
+        """Analyse a batch of texts into a distribution summary instead of per-text results.
+
+        Every worker summarises its chunk and only the summaries travel back to be merged.
+        The result cache is not used: a pass over millions of texts would just evict the
+        entries of the texts that are analysed again and again.
+
+        Args:
+            texts (list): texts to be analysed
+            summary (SentimentSummary, optional): summary the texts are added to, a new one if None. Defaults to None.
+
+        Returns:
+            SentimentSummary: the summary including the texts
+        """
+        summary = summary if summary is not None else SentimentSummary()
+        BATCH_SIZE.observe(len(texts))
+        with profiled(), STAGE_SECONDS.time("bulk_summary"):
+            chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+            if len(chunks) <= 1 or self.workers == 1:
+                return summary.merge(_summarise_with(self._in_process_analyser(), texts))
+            for partial in self.pool.map(_summarise_chunk, chunks):
+                summary.merge(partial)
+        logger.info("Summarised %d texts in %d chunks.", len(texts), len(chunks))
+        return summary
+
+    def _in_process_analyser(self) -> SentimentAnalyser:
+        if self._analyser is None:
+            self._analyser = SentimentAnalyser(backend=self.backend, segmenter=self.segmenter)
+        return self._analyser
+
+    def _score(self, texts: list) -> list:
+        """Analyse texts in-process or on the pool.
+
+        Batches that fit into a single chunk, or a pool of one worker, are analysed
+        in the calling process since shipping them to a worker only adds overhead.
+
+        Returns:
+            list: (full text result, confidence) tuple per text, in input order
+        """
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        if len(chunks) <= 1 or self.workers == 1:
+            return _score_with(self._in_process_analyser(), texts)
+        logger.info("Analysing %d texts in %d chunks.", len(texts), len(chunks))
+        return [item for chunk in self.pool.map(_analyse_chunk, chunks) for item in chunk]
+
+    def warm_up(self):
+        """Start the worker pool and wait until every worker has warmed up its analyser."""
+        if self.workers > 1:
+            all(self.pool.map(_worker_ready, range(self.workers)))
+            logger.info("%d bulk workers warmed up.", self.workers)
+
+    def shutdown(self):
+        """Stop the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,189 @@
+from collections import OrderedDict
+from typing import Optional
+from .metrics import CACHE_LOOKUPS, CACHE_SIZE
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger("backend")
+
+
+class ResultCache:
+    """Content-addressed cache for analysis results.
+
+    Results are keyed by a hash of the normalized text and the analysis type and kept
+    in an in-memory LRU with an optional time to live. When a SQLite path is given,
+    every result is also written there, so the cache survives restarts. The SQLite
+    table is pruned on startup and then at most every prune_interval seconds while
+    results are written: expired results are deleted and, above max_rows, the oldest
+    ones, so the file stops growing once its freed pages are reused.
+    """
+    def __init__(self, max_size: int = 10000, ttl: float = 0, path: Optional[str] = None, namespace: str = "",
+                 name: str = "results", max_rows: int = 0, prune_interval: float = 300):
+        """Initialize the cache.
+
+        Args:
+            max_size (int, optional): maximum number of results kept in memory. Defaults to 10000.
+            ttl (float, optional): seconds a result stays valid, 0 keeps it forever. Defaults to 0.
+            path (str, optional): SQLite file backing the cache. Defaults to None.
+            namespace (str, optional): part of every key, e.g. the analyser backend, so results of
+                different backends never mix in a persistent cache. Defaults to "".
+            name (str, optional): label of the cache in the metrics. Defaults to "results".
+            max_rows (int, optional): maximum number of results kept in SQLite, 0 keeps all. Defaults to 0.
+            prune_interval (float, optional): seconds between prunings of the SQLite table. Defaults to 300.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.namespace = namespace
+        self.name = name
+        self.max_rows = max_rows
+        self.prune_interval = prune_interval
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._pruned = 0.0
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT, created REAL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_created ON results (created)")
+            self._db.commit()
+            with self._lock:
+                self._prune()
+        logger.info("ResultCache %s initialized with size %d, ttl %s, path %s and %d persistent rows at most.",
+                    name, max_size, ttl, path, max_rows)
+
+    def key(self, text: str, analysis_type: str) -> str:
+        """Build the cache key of a text.
+
+        Only surrounding whitespace is normalized away, since everything else (case,
+        inner whitespace, punctuation) can change the tokenization and thus the result.
+
+        Args:
+            text (str): the analysed text
+            analysis_type (str): the kind of analysis, e.g. "full" or "sentence"
+
+        Returns:
+            str: hex digest identifying the text and analysis type
+        """
+        if self.namespace:
+            analysis_type = f"{self.namespace}\0{analysis_type}"
+        return hashlib.blake2b(f"{analysis_type}\0{text.strip()}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl > 0 and time.time() - created > self.ttl
+
+    def get(self, key: str):
+        """Return the cached result of a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[1]):
+                del self._entries[key]
+                entry = None
+            if entry is None and self._db is not None:
+                row = self._db.execute("SELECT value, created FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None and not self._expired(row[1]):
+                    entry = (json.loads(row[0]), row[1])
+                    self._store(key, entry)
+            if entry is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc(1, self.name, "miss")
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            CACHE_LOOKUPS.inc(1, self.name, "hit")
+            return entry[0]
+
+    def put(self, key: str, value):
+        """Cache the result of a key."""
+        entry = (value, time.time())
+        with self._lock:
+            self._store(key, entry)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), entry[1]),
+                )
+                self._db.commit()
+                self._maybe_prune()
+
+    def put_many(self, items):
+        """Cache several (key, result) pairs with a single SQLite commit."""
+        created = time.time()
+        items = list(items)
+        with self._lock:
+            for key, value in items:
+                self._store(key, (value, created))
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                    [(key, json.dumps(value), created) for key, value in items],
+                )
+                self._db.commit()
+                self._maybe_prune()
+
+    def prune(self) -> int:
+        """Delete the expired results and the oldest ones above max_rows from SQLite.
+
+        Returns:
+            int: number of deleted results
+        """
+        with self._lock:
+            return self._prune() if self._db is not None else 0
+
+    def _maybe_prune(self):
+        if time.monotonic() - self._pruned >= self.prune_interval:
+            self._prune()
+
+    def _prune(self) -> int:
+        db: sqlite3.Connection = self._db #type: ignore
+        self._pruned = time.monotonic()
+        deleted = 0
+        if self.ttl > 0:
+            deleted += db.execute("DELETE FROM results WHERE created < ?", (time.time() - self.ttl,)).rowcount
+        if self.max_rows > 0:
+            deleted += db.execute(
+                "DELETE FROM results WHERE key IN (SELECT key FROM results ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.max_rows,),
+            ).rowcount
+        db.commit()
+        if deleted:
+            logger.info("Pruned %d results from the persistent cache %s.", deleted, self.name)
+        return deleted
+
+    def _store(self, key: str, entry: tuple):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        CACHE_SIZE.set(len(self._entries), self.name)
+
+    def stats(self) -> dict:
+        """Return the hit and miss counters of the cache.
+
+        Returns:
+            dict: hits, misses, hit rate and the number of results held in memory
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "persistent": self._db is not None,
+            }
+
+    def close(self):
+        """Close the SQLite backing, if any."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -0,0 +1,62 @@
+# Category tables of the sentiment scores, shared by the frontend's SentimentCategorizer
+# and the bulk summaries of the API so both label a score the same way. Every table
+# lists (threshold, label) pairs, highest threshold first: a score gets the label of the
+# first threshold it exceeds, or the default label if it exceeds none.
+
+POLARITY_CATEGORIES = [
+    (0.9, "overwhelmingly positive"),
+    (0.5, "very positive"),
+    (0.1, "positive"),
+    (-0.1, "neutral"),
+    (-0.5, "negative"),
+    (-0.9, "very negative"),
+]
+POLARITY_DEFAULT = "overwhelmingly negative"
+SUBJECTIVITY_CATEGORIES = [
+    (0.9, "completely subjective"),
+    (0.5, "mostly subjective"),
+    (0.1, "slightly subjective"),
+    (0.0, "objective")
+]
+SUBJECTIVITY_DEFAULT = "completely objective"
+CONFIDENCE_CATEGORIES = [
+    #arbitary numbers, just a guess for now
+    (0.9, "overwhelmingly confident"),
+    (0.6, "very confident"),
+    (0.3, "confident"),
+    (0.2, "not very confident"),
+    (0.1, "not confident")
+]
+CONFIDENCE_DEFAULT = "not confident at all"
+
+# score -> (table, default label)
+CATEGORIES = {
+    "polarity": (POLARITY_CATEGORIES, POLARITY_DEFAULT),
+    "subjectivity": (SUBJECTIVITY_CATEGORIES, SUBJECTIVITY_DEFAULT),
+    "confidence": (CONFIDENCE_CATEGORIES, CONFIDENCE_DEFAULT),
+}
+
+
+def category_labels(table: list, default: str) -> list:
+    """Return the labels of a table from the lowest category to the highest, the order of category_codes."""
+    return [default] + [label for _, label in reversed(table)]
+
+
+def category_codes(scores, table: list):
+    """Categorize a batch of scores against a threshold table in one call.
+
+    Args:
+        scores (array-like): the scores, NaN exceeds no threshold and gets the default label
+        table (list): (threshold, label) table, highest threshold first
+
+    Returns:
+        ndarray: index of the category of every score into category_labels
+    """
+    import numpy as np
+
+    scores = np.asarray(scores, dtype=float)
+    thresholds = np.array([threshold for threshold, _ in reversed(table)])
+    # number of thresholds strictly below a score == index into the ascending labels
+    codes = np.searchsorted(thresholds, scores, side="left")
+    codes[np.isnan(scores)] = 0
+    return codes
@@ -0,0 +1,85 @@
+from textblob.en import sentiment as pattern_sentiment
+import logging
+
+logger = logging.getLogger("backend")
+
+
+class ConfidenceScorer:
+    """Scores the share of sentiment-bearing words in a text.
+
+    The pattern sentiment lexicon is loaded once per process and compiled into a
+    word -> polarity index, so scoring a text is a single dictionary lookup per token
+    instead of a full TextBlob sentiment run per word.
+    """
+
+    _index = None
+    _fallback = {}
+
+    def __init__(self):
+        if ConfidenceScorer._index is None:
+            ConfidenceScorer._index = self._build_index()
+            logger.info("Confidence lexicon index built with %d entries.", len(ConfidenceScorer._index))
+
+    @staticmethod
+    def _build_index() -> dict:
+        """Compile the pattern lexicon into a word -> polarity index.
+
+        Every lexicon form is scored once with the pattern scorer itself, so multi-token
+        forms ("can't", "full of life") carry the same negation and intensifier handling
+        TextBlob would apply to them.
+
+        Returns:
+            dict: mapping of lexicon form to its standalone polarity
+        """
+        if dict.__len__(pattern_sentiment) == 0:
+            pattern_sentiment.load()
+        index = {}
+        for form in list(dict.keys(pattern_sentiment)):
+            index[form] = pattern_sentiment(form)[0]
+        return index
+
+    def word_polarity(self, word: str) -> float:
+        """Return the polarity TextBlob would assign to a single word.
+
+        Args:
+            word (str): a single token as produced by TextBlob.words
+
+        Returns:
+            float: polarity of the word on its own
+        """
+        if word.isalpha():
+            # pattern lowercases alphabetic tokens and never splits them, so a known
+            # word scores its lexicon polarity and every other word scores 0.
+            return self._index.get(word.lower(), 0.0) #type: ignore
+        polarity = self._index.get(word) #type: ignore
+        if polarity is None:
+            polarity = self._fallback.get(word)
+            if polarity is None:
+                polarity = pattern_sentiment(word)[0]
+                if len(self._fallback) < 100_000:
+                    self._fallback[word] = polarity
+        return polarity
+
+    def score(self, words) -> float:
+        """Calculate the ratio of sentiment words to total words.
+
+        Args:
+            words (list): tokens of the text, as produced by TextBlob.words
+
+        Returns:
+            float: sentiment confidence score 0-1
+        """
+        if not words:
+            return 0
+        return self.count_sentiment_words(words) / len(words)
+
+    def count_sentiment_words(self, words) -> int:
+        """Count the words with a polarity, the numerator of score.
+
+        Args:
+            words (list): tokens of the text, as produced by TextBlob.words
+
+        Returns:
+            int: number of sentiment words
+        """
+        return sum(1 for word in words if self.word_polarity(word) != 0)
@@ -0,0 +1,158 @@
+"""Constant memory analysis of large one-column CSV files.
+
+The file is memory-mapped and read line by line in bounded chunks, every chunk is
+analysed with the BulkAnalyser and its results are appended to the output CSV right
+away, so neither the texts nor the results of the whole file are ever held at once.
+Every row must be a single line: a file with a line of several fields is rejected,
+as pandas rejects it in the frontend, and so is one with a quoted field spanning lines.
+
+Usage:
+    python -m nlp.ingest export.csv results.csv
+    python -m nlp.ingest export.csv results.csv --backend lexicon --workers 4 --chunk-size 20000
+"""
+import argparse
+import csv
+import logging
+import mmap
+import os
+import sys
+import time
+
+logger = logging.getLogger("backend")
+
+RESULT_COLUMNS = ("text", "polarity", "subjectivity", "confidence")
+
+
+def parse_csv_line(line: str) -> str:
+    """Extract the text of one line of a ";"-delimited one-column CSV without header.
+
+    A row must be a single line, so a quoted field may hold ";" but no line break.
+
+    Raises:
+        ValueError: if the line holds more than one field or a quoted field that is not closed
+    """
+    if '"' not in line:
+        if ";" in line:
+            raise ValueError(f"expected 1 field, saw {line.count(';') + 1}")
+        return line
+    try:
+        fields = next(csv.reader([line], delimiter=";", strict=True), [""])
+    except csv.Error as e:
+        raise ValueError(f"invalid quoting, a row must be a single line ({e})") from e
+    if len(fields) != 1:
+        raise ValueError(f"expected 1 field, saw {len(fields)}")
+    return fields[0]
+
+
+def iter_csv_chunks(path: str, chunk_size: int = 10000):
+    """Yield the texts of a ";"-delimited one-column CSV file in chunks.
+
+    The file is memory-mapped, so the operating system pages it in and out as the
+    lines are scanned and only the current chunk of texts lives in Python objects.
+    Blank lines are skipped, like pandas does.
+
+    Args:
+        path (str): path of the CSV file
+        chunk_size (int, optional): maximum number of texts per chunk. Defaults to 10000.
+
+    Raises:
+        ValueError: if a line is not a single field, see parse_csv_line
+
+    Yields:
+        tuple: (texts, offset) with the texts of the chunk and the number of bytes read so far
+    """
+    chunk_size = max(1, chunk_size)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            size = len(data)
+            position = 0
+            number = 0
+            texts = []
+            while position < size:
+                end = data.find(b"\n", position)
+                if end == -1:
+                    end = size
+                line = data[position:end].decode("utf-8", errors="replace").rstrip("\r")
+                position = end + 1
+                number += 1
+                if line.strip():
+                    try:
+                        texts.append(parse_csv_line(line))
+                    except ValueError as e:
+                        raise ValueError(f"{path}, line {number}: {e}") from e
+                if len(texts) >= chunk_size:
+                    yield texts, min(position, size)
+                    texts = []
+            if texts:
+                yield texts, size
+
+
+def analyse_csv_file(path: str, output_path: str, bulk_analyser, chunk_size: int = 10000,
+                     cache=None, progress_callback=None) -> int:
+    """Analyse every text of a large CSV file and write the results to another CSV file.
+
+    Args:
+        path (str): ";"-delimited one-column CSV file without header
+        output_path (str): CSV file the text, polarity, subjectivity and confidence columns are written to
+        bulk_analyser (BulkAnalyser): analyser the chunks are processed with
+        chunk_size (int, optional): number of texts analysed and written at once. Defaults to 10000.
+        cache (ResultCache, optional): result cache used while analysing. Defaults to None.
+        progress_callback (callable, optional): called as progress_callback(done, total) with the
+            bytes of the input processed after every chunk. Defaults to None.
+
+    Returns:
+        int: number of analysed texts
+    """
+    total = os.path.getsize(path)
+    rows = 0
+    with open(output_path, "w", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(RESULT_COLUMNS)
+        for texts, offset in iter_csv_chunks(path, chunk_size=chunk_size):
+            columns = bulk_analyser.analyse_columns(texts, cache=cache)
+            writer.writerows(zip(texts, columns["polarity"], columns["subjectivity"], columns["confidence"]))
+            rows += len(texts)
+            if progress_callback is not None:
+                progress_callback(offset, total)
+    logger.info("Analysed %d texts of %s into %s.", rows, path, output_path)
+    return rows
+
+
+def _print_progress(start: float):
+    def report(done: int, total: int):
+        elapsed = time.perf_counter() - start
+        share = done / total if total else 1.0
+        sys.stderr.write(f"\r{share:6.1%} of {total / 1e6:,.1f} MB, {done / 1e6 / max(elapsed, 1e-9):,.1f} MB/s")
+        sys.stderr.flush()
+    return report
+
+
+def main():
+    from .bulk import BulkAnalyser
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help='";"-delimited one-column CSV without header')
+    parser.add_argument("output", help="CSV file the results are written to")
+    parser.add_argument("--backend", default="textblob", help="analyser backend, textblob or lexicon")
+    parser.add_argument("--segmenter", default="punkt", help="sentence segmenter, punkt or rules")
+    parser.add_argument("--workers", type=int, default=0, help="worker processes, 0 uses all cores")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="texts read, analysed and written at once")
+    args = parser.parse_args()
+
+    bulk_analyser = BulkAnalyser(workers=args.workers, backend=args.backend, segmenter=args.segmenter)
+    start = time.perf_counter()
+    try:
+        rows = analyse_csv_file(args.input, args.output, bulk_analyser, chunk_size=args.chunk_size,
+                                progress_callback=_print_progress(start))
+    except ValueError as e:
+        sys.exit(f"\nInvalid CSV file: {e}")
+    finally:
+        bulk_analyser.shutdown()
+    elapsed = time.perf_counter() - start
+    sys.stderr.write(f"\nAnalysed {rows:,} texts in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/sec).\n")
+
+
+if __name__ == "__main__":
+    main()
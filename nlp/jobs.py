@@ -0,0 +1,298 @@
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger("backend")
+
+# seconds a statement waits for another process' write to finish before "database is locked"
+BUSY_TIMEOUT = 30
+# attempts of a transaction that still finds the database locked
+LOCKED_ATTEMPTS = 5
+
+
+class JobQueue:
+    """Runs bulk analyses as background jobs whose state and results live in SQLite.
+
+    A submitted job stores its texts and returns immediately. Worker threads analyse
+    the texts chunk by chunk with the BulkAnalyser and persist every finished chunk,
+    so progress can be polled while the job runs and unfinished jobs are resumed
+    where they stopped after a restart.
+
+    Several processes can share the database. A job is owned by the queue that queued
+    it through a lease, which a heartbeat thread renews while the process lives. Only
+    the owner processes the job, and every queue periodically takes over the unfinished
+    jobs without a live lease, those of a crashed process or of one that shut down.
+    """
+    def __init__(self, bulk_analyser, cache=None, path: str = "jobs.db", workers: int = 2, chunk_size: int = 1000,
+                 lease_seconds: float = 30):
+        """Initialize the job queue.
+
+        Args:
+            bulk_analyser (BulkAnalyser): analyser the chunks are processed with
+            cache (ResultCache, optional): result cache used while analysing. Defaults to None.
+            path (str, optional): SQLite file holding job state and results. Defaults to "jobs.db".
+            workers (int, optional): number of jobs processed at the same time. Defaults to 2.
+            chunk_size (int, optional): number of texts analysed and persisted at once. Defaults to 1000.
+            lease_seconds (float, optional): seconds a job stays owned without a heartbeat of its owner. Defaults to 30.
+        """
+        self.bulk_analyser = bulk_analyser
+        self.cache = cache
+        self.chunk_size = max(1, chunk_size)
+        self.lease_seconds = lease_seconds
+        self.owner = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        # jobs queued or running in this process
+        self._active = set()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=BUSY_TIMEOUT)
+        # readers and the writer of the serve.py workers sharing the file do not block each other
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY, status TEXT, total INTEGER, done INTEGER,
+                created REAL, updated REAL, error TEXT);
+            CREATE TABLE IF NOT EXISTS job_texts (
+                job_id TEXT, idx INTEGER, text TEXT, PRIMARY KEY (job_id, idx));
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT, idx INTEGER, polarity REAL, subjectivity REAL, confidence REAL,
+                PRIMARY KEY (job_id, idx));
+        """)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease", "REAL")):
+            if column not in columns:
+                self._db.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._db.commit()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="bulk-job")
+        self._heartbeat = threading.Thread(target=self._renew_leases, name="bulk-job-lease", daemon=True)
+        self._heartbeat.start()
+        logger.info("JobQueue initialized with %d workers at %s.", workers, path)
+
+    def submit(self, texts: list) -> dict:
+        """Store a new job and queue it for processing.
+
+        Args:
+            texts (list): texts to be analysed
+
+        Returns:
+            dict: id, status and size of the new job
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        def insert(db):
+            db.execute(
+                "INSERT INTO jobs (id, status, total, done, created, updated, error, owner, lease) "
+                "VALUES (?, 'queued', ?, 0, ?, ?, NULL, ?, ?)",
+                (job_id, len(texts), now, now, self.owner, now + self.lease_seconds),
+            )
+            db.executemany(
+                "INSERT INTO job_texts (job_id, idx, text) VALUES (?, ?, ?)",
+                ((job_id, idx, text) for idx, text in enumerate(texts)),
+            )
+            self._active.add(job_id)
+
+        self._transaction(insert)
+        self._executor.submit(self._run, job_id)
+        logger.info("Job %s with %d texts queued.", job_id, len(texts))
+        return {"job_id": job_id, "status": "queued", "total": len(texts)}
+
+    def resume(self):
+        """Take over and queue every unfinished job without a live lease.
+
+        These are the jobs of a process that shut down or crashed, including this
+        process' previous run. Each one is claimed with a single conditional update, so
+        of several queues resuming at once only one gets a job.
+        """
+        now = time.time()
+
+        def claim(db) -> list:
+            candidates = [row[0] for row in db.execute(
+                "SELECT id FROM jobs WHERE status IN ('queued', 'running') AND (owner IS NULL OR lease < ?) "
+                "ORDER BY created", (now,))]
+            claimed = []
+            for job_id in candidates:
+                if job_id not in self._active and db.execute(
+                    "UPDATE jobs SET owner = ?, lease = ? WHERE id = ? AND status IN ('queued', 'running') "
+                    "AND (owner IS NULL OR lease < ?)",
+                    (self.owner, now + self.lease_seconds, job_id, now),
+                ).rowcount:
+                    claimed.append(job_id)
+            self._active.update(claimed)
+            return claimed
+
+        job_ids = self._transaction(claim)
+        for job_id in job_ids:
+            self._executor.submit(self._run, job_id)
+        if job_ids:
+            logger.info("Resumed %d unfinished jobs.", len(job_ids))
+
+    def _renew_leases(self):
+        """Renew the leases of the jobs queued or running here and take over orphaned ones until shutdown.
+
+        A job this process gave up on is not renewed, so its lease runs out and it is resumed.
+        """
+        def renew(db):
+            lease = time.time() + self.lease_seconds
+            db.executemany("UPDATE jobs SET lease = ? WHERE id = ? AND owner = ?",
+                           [(lease, job_id, self.owner) for job_id in self._active])
+
+        while not self._stopping.wait(self.lease_seconds / 3):
+            try:
+                self._transaction(renew)
+                self.resume()
+            except Exception as e:
+                logger.error("Renewing the job leases failed: %s", e)
+
+    def _transaction(self, operation):
+        """Run operation(db) under the lock and commit it, retrying while the database is locked.
+
+        Another serve.py worker writing a large job can hold the database longer than
+        the busy timeout; the transaction is then rolled back and tried again.
+
+        Raises:
+            sqlite3.OperationalError: if the database is still locked after LOCKED_ATTEMPTS attempts
+        """
+        for attempt in range(1, LOCKED_ATTEMPTS + 1):
+            with self._lock:
+                try:
+                    result = operation(self._db)
+                    self._db.commit()
+                    return result
+                except sqlite3.OperationalError as e:
+                    self._db.rollback()
+                    if attempt == LOCKED_ATTEMPTS or "locked" not in str(e):
+                        raise
+                    logger.warning("Job database locked, retrying (attempt %d of %d).", attempt, LOCKED_ATTEMPTS)
+            time.sleep(0.1 * 2 ** attempt)
+
+    def _run(self, job_id: str):
+        """Process a job chunk by chunk, starting after its last persisted chunk."""
+        def start(db) -> bool:
+            return db.execute(
+                "UPDATE jobs SET status = 'running', updated = ? WHERE id = ? AND owner = ? "
+                "AND status IN ('queued', 'running')",
+                (time.time(), job_id, self.owner),
+            ).rowcount > 0
+
+        def read_chunk(db) -> list:
+            done = db.execute("SELECT done FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            return db.execute(
+                "SELECT idx, text FROM job_texts WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT ?",
+                (job_id, done, self.chunk_size),
+            ).fetchall()
+
+        def write_chunk(db, rows: list, columns: dict) -> bool:
+            if not db.execute(
+                "UPDATE jobs SET done = ?, updated = ? WHERE id = ? AND owner = ?",
+                (rows[-1][0] + 1, time.time(), job_id, self.owner),
+            ).rowcount:
+                return False
+            db.executemany(
+                "INSERT OR REPLACE INTO job_results (job_id, idx, polarity, subjectivity, confidence) VALUES (?, ?, ?, ?, ?)",
+                ((job_id, idx, polarity, subjectivity, confidence) for (idx, _), polarity, subjectivity, confidence
+                 in zip(rows, columns["polarity"], columns["subjectivity"], columns["confidence"])),
+            )
+            return True
+
+        try:
+            if not self._transaction(start):
+                logger.info("Job %s is owned by another process, skipping it.", job_id)
+                return
+            while True:
+                if self._stopping.is_set():
+                    logger.info("Job %s interrupted by shutdown, another worker or the next start resumes it.", job_id)
+                    return
+                rows = self._transaction(read_chunk)
+                if not rows:
+                    break
+                columns = self.bulk_analyser.analyse_columns([text for _, text in rows], cache=self.cache)
+                if not self._transaction(lambda db: write_chunk(db, rows, columns)):
+                    logger.warning("Job %s was taken over by another process after its lease expired.", job_id)
+                    return
+            if self._set_status(job_id, "done"):
+                self._transaction(lambda db: db.execute("DELETE FROM job_texts WHERE job_id = ?", (job_id,)))
+                logger.info("Job %s completed.", job_id)
+        except sqlite3.OperationalError as e:
+            # nothing is wrong with the job, its lease runs out and it is resumed
+            logger.error("Job %s paused, the job database is unavailable: %s", job_id, e)
+        except Exception as e:
+            logger.error("Job %s failed: %s", job_id, e)
+            try:
+                self._set_status(job_id, "failed", error=str(e))
+            except sqlite3.OperationalError as e:
+                logger.error("Unable to mark job %s as failed: %s", job_id, e)
+        finally:
+            with self._lock:
+                self._active.discard(job_id)
+
+    def _set_status(self, job_id: str, status: str, error=None) -> bool:
+        """Set the status of a job this queue still owns.
+
+        Returns:
+            bool: False if another process took the job over after its lease expired
+        """
+        updated = self._transaction(lambda db: db.execute(
+            "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE id = ? AND owner = ?",
+            (status, error, time.time(), job_id, self.owner),
+        ).rowcount)
+        if not updated:
+            logger.warning("Job %s was taken over by another process, its status stays as set there.", job_id)
+        return bool(updated)
+
+    def get(self, job_id: str, offset: int = 0, limit: int = 1000):
+        """Return the state of a job and a page of its finished results.
+
+        Args:
+            job_id (str): id of the job
+            offset (int, optional): index of the first result of the page. Defaults to 0.
+            limit (int, optional): maximum number of results in the page. Defaults to 1000.
+
+        Returns:
+            dict: job status, progress and results, None if the job is unknown
+        """
+        with self._lock:
+            job = self._db.execute(
+                "SELECT status, total, done, created, updated, error FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if job is None:
+                return None
+            rows = self._db.execute(
+                "SELECT idx, polarity, subjectivity, confidence FROM job_results WHERE job_id = ? AND idx >= ? ORDER BY idx LIMIT ?",
+                (job_id, offset, limit),
+            ).fetchall()
+        status, total, done, created, updated, error = job
+        return {
+            "job_id": job_id,
+            "status": status,
+            "total": total,
+            "done": done,
+            "progress": done / total if total else 1.0,
+            "created": created,
+            "updated": updated,
+            "error": error,
+            "offset": offset,
+            "results": [
+                {"index": idx, "polarity": polarity, "subjectivity": subjectivity, "confidence": confidence}
+                for idx, polarity, subjectivity, confidence in rows
+            ],
+        }
+
+    def shutdown(self):
+        """Stop accepting work, wait for the running chunks and close the database.
+
+        Jobs that are interrupted keep their persisted progress, their leases are
+        released so another process or the next start resumes them right away.
+        """
+        self._stopping.set()
+        self._heartbeat.join()
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET owner = NULL, lease = NULL WHERE owner = ? AND status IN ('queued', 'running')",
+                (self.owner,),
+            )
+            self._db.commit()
+            self._db.close()
@@ -0,0 +1,172 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from bisect import bisect_left
+import threading
+import time
+
+# Minimal in-process metrics registry rendered in the Prometheus text format, so the
+# API can expose /metrics without an extra dependency.
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labels: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *label_values):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def set(self, value: float, *label_values):
+        """Mirror a counter that is kept elsewhere, e.g. the hit counter of the result cache."""
+        with self._lock:
+            self._values[label_values] = value
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, _format_labels(self.labels, key), value) for key, value in self._values.items()]
+
+
+class Gauge(Counter):
+    """Value that can go up and down, optionally split by labels."""
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, *label_values):
+        self.inc(-amount, *label_values)
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, optionally split by labels."""
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labels: tuple = (), buckets: tuple = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        with self._lock:
+            counts = self._values.get(label_values)
+            if counts is None:
+                counts = self._values[label_values] = [[0] * len(self.buckets), 0, 0.0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                counts[0][index] += 1
+            counts[1] += 1
+            counts[2] += value
+
+    @contextmanager
+    def time(self, *label_values):
+        """Observe the duration of the with block in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *label_values)
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            for key, (buckets, count, total) in self._values.items():
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, buckets):
+                    cumulative += bucket_count
+                    samples.append((f"{self.name}_bucket", _format_labels(self.labels, key, f'le="{bound}"'), cumulative))
+                samples.append((f"{self.name}_bucket", _format_labels(self.labels, key, 'le="+Inf"'), count))
+                samples.append((f"{self.name}_count", _format_labels(self.labels, key), count))
+                samples.append((f"{self.name}_sum", _format_labels(self.labels, key), total))
+        return samples
+
+
+class Registry:
+    """Collection of metrics rendered together."""
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(f"{name}{labels} {value}" for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by method, route and status.", ("method", "path", "status")))
+REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "Time until the response headers are sent, by route.", ("path",)))
+IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "Requests currently being handled."))
+STAGE_SECONDS = REGISTRY.register(Histogram(
+    "analysis_stage_seconds", "Time spent per analysis stage and call (a single text or a batch).", ("stage",)))
+BATCH_SIZE = REGISTRY.register(Histogram(
+    "bulk_batch_size", "Number of texts per bulk batch.", (),
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000, 100000)))
+MICRO_BATCH_SIZE = REGISTRY.register(Histogram(
+    "analyse_micro_batch_size", "Number of concurrent /analyse texts analysed per micro batch.", (),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)))
+MICRO_BATCH_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "analyse_micro_batch_wait_seconds", "Time a text waited for its micro batch to start."))
+CACHE_LOOKUPS = REGISTRY.register(Counter(
+    "result_cache_lookups_total", "Result cache lookups by cache and outcome.", ("cache", "outcome")))
+CACHE_SIZE = REGISTRY.register(Gauge(
+    "result_cache_size", "Results currently held in memory, by cache.", ("cache",)))
+
+
+# Per-request profiling: the API middleware puts a cProfile.Profile into this
+# context variable for sampled requests, and the analysis code enables it while
+# it runs, on whatever thread the request is handled.
+_profile = ContextVar("profile", default=None)
+_profiling = ContextVar("profiling", default=False)
+
+
+def start_request_profile(profile):
+    """Attach a profiler to the current request context."""
+    return _profile.set(profile)
+
+
+def stop_request_profile(token):
+    """Detach the profiler of the current request context."""
+    _profile.reset(token)
+
+
+@contextmanager
+def profiled():
+    """Enable the request profiler, if the current request is sampled, for the with block."""
+    profile = _profile.get()
+    if profile is None or _profiling.get():
+        yield
+        return
+    token = _profiling.set(True)
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        _profiling.reset(token)
@@ -0,0 +1,89 @@
+from functools import lru_cache
+import re
+
+# Rule based sentence segmenter, an alternative to NLTK's Punkt for the "sentence" mode.
+# A sentence ends at a run of ".", "!" or "?", optionally followed by closing quotes or
+# brackets, when whitespace follows. Like Punkt, a period does not end a sentence after
+# an abbreviation ("e.g.", "Mr.", "U.S.") or an initial ("J. Smith"), and neither does
+# an ellipsis. sentence_spans returns offsets, which is what the boundary comparison of
+# benchmarks/segmenter.py needs; the backends score strings, so split_sentences slices
+# a copy of every sentence, just like Punkt's tokenize does.
+
+SEGMENTERS = ("punkt", "rules")
+
+_BOUNDARY = re.compile(r"[.!?]+[\"'”’)\]]*(?=\s)")
+_INITIALISM = re.compile(r"^(?:\w\.)+\w$")
+_EXTRA_ABBREVIATIONS = (
+    "mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "mt.", "vol.", "inc.", "ltd.", "co.",
+    "corp.", "dept.", "approx.", "jan.", "feb.", "mar.", "apr.", "jun.", "jul.", "aug.", "sep.", "sept.",
+    "oct.", "nov.", "dec.",
+)
+
+
+@lru_cache(maxsize=None)
+def _abbreviations() -> frozenset:
+    """Return TextBlob's abbreviations and a few common extras, importing TextBlob on first use."""
+    from textblob._text import ABBREVIATIONS
+
+    return frozenset(abbreviation.lower() for abbreviation in ABBREVIATIONS) | frozenset(_EXTRA_ABBREVIATIONS)
+
+
+def _ends_sentence(text: str, start: int, end: int, abbreviations: frozenset) -> bool:
+    """Decide whether the punctuation run text[start:end] ends a sentence."""
+    if text[start] != "." or "!" in text[start:end] or "?" in text[start:end]:
+        return True
+    token_start = max(text.rfind(" ", 0, start), text.rfind("\n", 0, start), text.rfind("\t", 0, start)) + 1
+    token = text[token_start:start].lstrip("\"'“‘([").lower()
+    if end - start > 1 and text[start + 1] == ".":
+        return False
+    if not token:
+        return True
+    if len(token) == 1 and token.isalpha():
+        return False
+    return f"{token}." not in abbreviations and _INITIALISM.match(token) is None
+
+
+def sentence_spans(text: str) -> list:
+    """Find the sentences of a text as offsets into it.
+
+    Args:
+        text (str): text to be segmented
+
+    Returns:
+        list: (start, end) of every sentence, so text[start:end] is the sentence without
+            surrounding whitespace. A text without sentence end has a single span,
+            an empty or blank text none.
+    """
+    spans = []
+    start = 0
+    length = len(text)
+    abbreviations = _abbreviations()
+    for boundary in _BOUNDARY.finditer(text):
+        end = boundary.end()
+        if end <= start or not _ends_sentence(text, boundary.start(), end, abbreviations):
+            continue
+        while start < end and text[start].isspace():
+            start += 1
+        if start < end:
+            spans.append((start, end))
+        start = end
+    while start < length and text[start].isspace():
+        start += 1
+    end = length
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append((start, end))
+    return spans
+
+
+def split_sentences(text: str) -> list:
+    """Split a text into its sentences, see sentence_spans.
+
+    Args:
+        text (str): text to be segmented
+
+    Returns:
+        list: the sentences as strings
+    """
+    return [text[start:end] for start, end in sentence_spans(text)]
@@ -0,0 +1,208 @@
+from .categories import CATEGORIES, category_codes, category_labels
+import math
+import numpy as np
+
+# fine bins per score, the resolution of the quantiles; coarser histograms are sums of them
+SKETCH_BINS = 2000
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+# score -> value range of its bins
+SCORE_RANGES = {
+    "polarity": (-1.0, 1.0),
+    "subjectivity": (0.0, 1.0),
+    "confidence": (0.0, 1.0),
+}
+
+
+def _value(value: float):
+    return None if math.isnan(value) or math.isinf(value) else value
+
+
+class ScoreSummary:
+    """Running statistics of one score in constant memory.
+
+    Mean and variance are kept with Welford's algorithm, updated a batch at a time with
+    the pairwise form of Chan et al., which is also how two summaries are merged. The
+    scores are bounded, so a histogram of SKETCH_BINS equal bins over their range, with
+    the sum of the values in each bin, is the quantile sketch: it merges exactly by
+    adding counts and sums, and a quantile read from it is off by at most one bin width,
+    0.001 for polarity and 0.0005 for the others.
+    """
+    def __init__(self, low: float, high: float, bins: int = SKETCH_BINS):
+        """Initialize an empty summary.
+
+        Args:
+            low (float): lower end of the score range
+            high (float): upper end of the score range, values outside fall into the outer bins
+            bins (int, optional): number of bins of the quantile sketch. Defaults to SKETCH_BINS.
+        """
+        self.low = low
+        self.high = high
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.bins = np.zeros(bins, dtype=np.int64)
+        self.sums = np.zeros(bins)
+
+    def add(self, values: np.ndarray):
+        """Add a batch of scores, which must not contain NaN."""
+        if not len(values):
+            return
+        mean = float(values.mean())
+        self._combine(len(values), mean, float(np.square(values - mean).sum()))
+        self.minimum = min(self.minimum, float(values.min()))
+        self.maximum = max(self.maximum, float(values.max()))
+        width = (self.high - self.low) / len(self.bins)
+        index = np.clip(np.floor((values - self.low) / width), 0, len(self.bins) - 1).astype(np.int64)
+        self.bins += np.bincount(index, minlength=len(self.bins))
+        self.sums += np.bincount(index, weights=values, minlength=len(self.bins))
+
+    def _combine(self, count: int, mean: float, m2: float):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def merge(self, other: "ScoreSummary"):
+        """Add the scores summarised by another summary of the same range and bins."""
+        if (other.low, other.high, len(other.bins)) != (self.low, self.high, len(self.bins)):
+            raise ValueError("Only summaries with the same range and bins can be merged.")
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+            self.minimum = min(self.minimum, other.minimum)
+            self.maximum = max(self.maximum, other.maximum)
+            self.bins += other.bins
+            self.sums += other.sums
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1), NaN for fewer than two scores."""
+        return self.m2 / (self.count - 1) if self.count > 1 else math.nan
+
+    def quantile(self, q: float) -> float:
+        """Approximate a quantile like numpy.quantile's default linear interpolation.
+
+        The two order statistics around the quantile are located in their bins, taken as
+        the mean of the values in these bins, and interpolated between. Frequent exact
+        scores like 0.0 thus come out exactly.
+        """
+        if not self.count:
+            return math.nan
+        cumulative = np.cumsum(self.bins)
+        position = q * (self.count - 1)
+        lower = self._order_statistic(cumulative, math.floor(position))
+        upper = self._order_statistic(cumulative, math.ceil(position))
+        return lower + (upper - lower) * (position - math.floor(position))
+
+    def _order_statistic(self, cumulative: np.ndarray, rank: int) -> float:
+        index = int(np.searchsorted(cumulative, rank, side="right"))
+        return float(self.sums[index] / self.bins[index])
+
+    def histogram(self, bins: int = 20) -> dict:
+        """Counts of equal bins over the score range.
+
+        Args:
+            bins (int, optional): number of bins, a divisor of the sketch bins. Defaults to 20.
+
+        Raises:
+            ValueError: if bins does not divide the number of sketch bins
+
+        Returns:
+            dict: the bins+1 edges and the counts of the bins
+        """
+        if bins < 1 or len(self.bins) % bins:
+            raise ValueError(f"The histogram bins must divide {len(self.bins)}.")
+        edges = np.linspace(self.low, self.high, bins + 1)
+        return {"edges": edges.round(6).tolist(), "counts": self.bins.reshape(bins, -1).sum(axis=1).tolist()}
+
+    def to_dict(self, bins: int = 20) -> dict:
+        """Return count, mean, variance, standard deviation, min, max, quantiles and histogram."""
+        return {
+            "count": self.count,
+            "mean": _value(self.mean) if self.count else None,
+            "variance": _value(self.variance),
+            "std": _value(math.sqrt(self.variance)) if self.count > 1 else None,
+            "min": _value(self.minimum),
+            "max": _value(self.maximum),
+            "quantiles": {f"p{q * 100:g}": _value(self.quantile(q)) for q in QUANTILES},
+            "histogram": self.histogram(bins),
+        }
+
+
+class SentimentSummary:
+    """Distribution of the full text results of a bulk analysis, without the single rows.
+
+    Holds a ScoreSummary per score and the counts per category of the tables in
+    nlp.categories, the ones the frontend's SentimentCategorizer labels rows with.
+    Texts that could not be analysed are only counted as failed. Summaries of parallel
+    chunks are combined with merge, so a worker can send its summary instead of its rows.
+    """
+    def __init__(self):
+        self.failed = 0
+        self.scores = {name: ScoreSummary(low, high) for name, (low, high) in SCORE_RANGES.items()}
+        self.categories = {name: np.zeros(len(table) + 1, dtype=np.int64) for name, (table, _) in CATEGORIES.items()}
+
+    @property
+    def count(self) -> int:
+        """Number of successfully analysed texts."""
+        return self.scores["polarity"].count
+
+    def add(self, polarity, subjectivity, confidence) -> "SentimentSummary":
+        """Add a batch of results, a failed text has NaN or None as polarity and subjectivity.
+
+        Args:
+            polarity (list or ndarray): polarity per text
+            subjectivity (list or ndarray): subjectivity per text
+            confidence (list or ndarray): confidence per text
+
+        Returns:
+            SentimentSummary: this summary
+        """
+        columns = {
+            "polarity": np.asarray(polarity, dtype=float),
+            "subjectivity": np.asarray(subjectivity, dtype=float),
+            "confidence": np.asarray(confidence, dtype=float),
+        }
+        analysed = ~(np.isnan(columns["polarity"]) | np.isnan(columns["subjectivity"]) | np.isnan(columns["confidence"]))
+        self.failed += int(len(analysed) - analysed.sum())
+        for name, values in columns.items():
+            values = values[analysed]
+            self.scores[name].add(values)
+            table, _ = CATEGORIES[name]
+            self.categories[name] += np.bincount(category_codes(values, table), minlength=len(table) + 1)
+        return self
+
+    def merge(self, other: "SentimentSummary") -> "SentimentSummary":
+        """Add the results summarised by another summary.
+
+        Returns:
+            SentimentSummary: this summary
+        """
+        self.failed += other.failed
+        for name, score in self.scores.items():
+            score.merge(other.scores[name])
+        for name, counts in self.categories.items():
+            counts += other.categories[name]
+        return self
+
+    def to_dict(self, bins: int = 20) -> dict:
+        """Return the summary as JSON serializable dictionary.
+
+        Args:
+            bins (int, optional): number of histogram bins per score, a divisor of SKETCH_BINS. Defaults to 20.
+
+        Returns:
+            dict: count and failed texts, the statistics per score and the category
+                counts per score, labels from the lowest to the highest category
+        """
+        return {
+            "count": self.count,
+            "failed": self.failed,
+            "scores": {name: score.to_dict(bins) for name, score in self.scores.items()},
+            "categories": {
+                name: dict(zip(category_labels(table, default), self.categories[name].tolist()))
+                for name, (table, default) in CATEGORIES.items()
+            },
+        }
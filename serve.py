@@ -0,0 +1,124 @@
+"""Production entry point: several API worker processes sharing preloaded models.
+
+The master process imports the app and loads the sentiment lexicons and the sentence
+tokenizer before it forks the workers, so their memory pages are shared copy-on-write
+instead of being loaded once per worker. The workers accept connections on one
+listening socket and a worker that dies is restarted.
+
+Usage:
+    python serve.py
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import gc
+import importlib
+import logging
+import os
+import signal
+import socket
+import time
+
+import uvicorn
+
+from api_app import app
+from api.arrow import arrow_available
+from api.config import get_config
+from nlp import SentimentAnalyser
+
+logger = logging.getLogger("backend")
+
+
+def preload(backend: str, segmenter: str = "punkt"):
+    """Load everything the analysers load lazily, before the workers are forked.
+
+    The lexicons live in class and module level caches, so the analysers the workers
+    create in their lifespan reuse them. Freezing the garbage collector afterwards
+    keeps collections in the workers from writing to, and thereby copying, the
+    pages of the preloaded objects.
+    """
+    SentimentAnalyser(backend=backend, segmenter=segmenter).warm_up()
+    if arrow_available():
+        # the API imports pyarrow with the first Arrow request, share it instead
+        importlib.import_module("pyarrow")
+    gc.collect()
+    gc.freeze()
+    logger.info("Preloaded the %s backend for the workers.", backend)
+
+
+def bind(host: str, port: int, backlog: int = 2048) -> socket.socket:
+    """Open the listening socket the workers share."""
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def spawn(index: int, sock: socket.socket) -> int:
+    """Fork a worker that serves the app on the shared socket and return its pid."""
+    pid = os.fork()
+    if pid:
+        return pid
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    status = 0
+    try:
+        uvicorn.Server(uvicorn.Config(app, log_config=None, timeout_graceful_shutdown=10)).run(sockets=[sock])
+    except BaseException:
+        logger.exception("Worker %d crashed.", index)
+        status = 1
+    finally:
+        logging.shutdown()
+        os._exit(status)
+
+
+def main():
+    config = get_config()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=config.get("serve_host", "127.0.0.1"), help="interface to listen on")
+    parser.add_argument("--port", type=int, default=config.get("serve_port", 8000), help="port to listen on")
+    parser.add_argument("--workers", type=int, default=config.get("serve_workers", 0),
+                        help="worker processes, 0 uses all cores")
+    args = parser.parse_args()
+    workers = args.workers or os.cpu_count() or 1
+
+    # every worker starts its own bulk pool, so split the cores between them
+    if not config.get("bulk_workers"):
+        config["bulk_workers"] = max(1, (os.cpu_count() or 1) // workers)
+
+    preload(config.get("analyser_backend", "textblob"), config.get("sentence_segmenter", "punkt"))
+    sock = bind(args.host, args.port)
+    processes = {spawn(index, sock): index for index in range(workers)}
+    logger.info("Serving on %s:%d with %d workers.", args.host, args.port, workers)
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in processes:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while processes:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        index = processes.pop(pid, None)
+        if index is None or stopping:
+            continue
+        logger.warning("Worker %d (pid %d) exited with %d, restarting it.", index, pid, os.waitstatus_to_exitcode(status))
+        time.sleep(1)
+        processes[spawn(index, sock)] = index
+    sock.close()
+    logger.info("All workers stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""The confidence score equals the original per-word TextBlob scoring on the bundled test data.
+
+The original implementation ran a TextBlob sentiment analysis per word of the text:
+
+    sentiment_words = [word for word in blob.words if TextBlob(word).sentiment.polarity != 0]
+    confidence = len(sentiment_words) / len(blob.words) if blob.words else 0
+
+ConfidenceScorer replaced it with a lookup in the compiled lexicon, which must not
+change a single score. The rule based segmenter tokenizes words without Punkt, so its
+case runs even where the NLTK punkt data is not installed.
+"""
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+textblob = pytest.importorskip("textblob")
+nltk = pytest.importorskip("nltk")
+
+from benchmarks.suite import load_bundled
+from nlp.analyser import SentimentAnalyser
+from nlp.confidence import ConfidenceScorer
+from nlp.segmenter import split_sentences
+
+
+def _punkt_available() -> bool:
+    for resource in ("tokenizers/punkt_tab", "tokenizers/punkt"):
+        try:
+            nltk.data.find(resource)
+            return True
+        except LookupError:
+            pass
+    return False
+
+
+requires_punkt = pytest.mark.skipif(not _punkt_available(), reason="NLTK punkt data is not installed")
+
+
+@pytest.fixture(scope="module")
+def texts() -> list:
+    return load_bundled()
+
+
+def rules_words(text: str) -> list:
+    """The words of a text as the rule based segmenter path tokenizes them, without Punkt."""
+    words = []
+    for sentence in split_sentences(text):
+        for token in nltk.tokenize.word_tokenize(sentence, preserve_line=True):
+            word = token if token.startswith("'") else textblob.utils.strip_punc(token, all=False)
+            if textblob.utils.strip_punc(token, all=False):
+                words.append(word)
+    return words
+
+
+def reference_confidence(text: str, polarities: dict, words=None) -> float:
+    """The original per-word TextBlob scoring, memoizing the polarity of every word.
+
+    The words default to TextBlob(text).words, which needs Punkt.
+    """
+    if words is None:
+        words = textblob.TextBlob(text).words
+    if not words:
+        return 0
+    sentiment_words = 0
+    for word in words:
+        if word not in polarities:
+            polarities[word] = textblob.TextBlob(word).sentiment.polarity
+        sentiment_words += polarities[word] != 0
+    return sentiment_words / len(words)
+
+
+@requires_punkt
+def test_scorer_matches_per_word_textblob(texts):
+    scorer = ConfidenceScorer()
+    polarities = {}
+    mismatches = [text for text in texts
+                  if scorer.score(textblob.TextBlob(text).words) != reference_confidence(text, polarities)]
+    assert not mismatches, f"{len(mismatches)} of {len(texts)} texts differ, e.g. {mismatches[:3]}"
+
+
+@requires_punkt
+def test_analyser_confidence_matches_per_word_textblob(texts):
+    analyser = SentimentAnalyser()
+    polarities = {}
+    columns = analyser.analyse_batch(texts, modes=("confidence",))
+    mismatches = [text for text, confidence in zip(texts, columns["confidence"])
+                  if confidence != reference_confidence(text, polarities)]
+    assert not mismatches, f"{len(mismatches)} of {len(texts)} texts differ, e.g. {mismatches[:3]}"
+
+
+def test_rules_segmenter_confidence_matches_per_word_textblob(texts):
+    analyser = SentimentAnalyser(segmenter="rules")
+    polarities = {}
+    columns = analyser.analyse_batch(texts, modes=("confidence",))
+    mismatches = [text for text, confidence in zip(texts, columns["confidence"])
+                  if confidence != reference_confidence(text, polarities, rules_words(text))]
+    assert not mismatches, f"{len(mismatches)} of {len(texts)} texts differ, e.g. {mismatches[:3]}"
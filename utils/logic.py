@@ -1,76 +1,557 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+import http.client
+import importlib.util
 import logging
-import pandas as pd
+import os
+import threading
+import time
+import json
+from nlp import categories
+from nlp.categories import category_codes, category_labels
+
+# pandas, NumPy and pyarrow are imported by the bulk methods that use them, so the
+# single text page and short-lived scripts do not pay for them at startup
+if TYPE_CHECKING:
+    import pandas as pd
+
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
 
 
 logger = logging.getLogger("frontend")
 
+
+class UnprocessedRetry(Retry):
+    """Retry that only sends a request again if the server cannot have processed it.
+
+    Idempotent methods are retried on every status of status_forcelist and on read
+    errors. Other methods, like the POST that submits a bulk job, only on 429 and 503,
+    which the API answers before doing any work, so a job is never submitted twice.
+    Failed connections are retried for every method.
+    """
+    UNPROCESSED_STATUSES = frozenset({429, 503})
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if not self._is_method_retryable(method):
+            return status_code in self.UNPROCESSED_STATUSES
+        return super().is_retry(method, status_code, has_retry_after)
+
+
 class RequestHandler():
     """A class to handle requests to the sentiment analysis API."""
-    def __init__(self, url: str = "http://localhost:8000"):
-        """Initialize the RequestHandler with a base URL."""
+    def __init__(self, url: str = "http://localhost:8000", timeout: float = 30.0, batch_size: int = 500,
+                 max_concurrency: int = 4, retries: int = 3):
+        """Initialize the RequestHandler with a base URL.
+
+        Requests go through one pooled session with keep-alive connections, so repeated
+        calls reuse their TCP connections.
+
+        Args:
+            url (str, optional): base URL of the API. Defaults to "http://localhost:8000".
+            timeout (float, optional): seconds to wait for a connection or response. Defaults to 30.0.
+            batch_size (int, optional): maximum number of texts per bulk request. Defaults to 500.
+            max_concurrency (int, optional): number of bulk requests in flight at once. Defaults to 4.
+            retries (int, optional): retries for failed connections and 429/502/503/504 responses, after
+                the Retry-After of a 429 or 503 response. POSTs are only retried on 429 and 503,
+                see UnprocessedRetry. Defaults to 3.
+        """
         self.url = url
-        logger.info(f"RequestHandler initialized with URL: {self.url}")
+        self.timeout = timeout
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        retry = UnprocessedRetry(total=retries, backoff_factor=0.5, status_forcelist=(429, 502, 503, 504),
+                                 respect_retry_after_header=True)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency, max_retries=retry)
+        # the bulk requests fall back to JSON without pyarrow
+        self.use_arrow = importlib.util.find_spec("pyarrow") is not None
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        logger.info("RequestHandler initialized with URL: %s", self.url)
+
+    def close(self):
+        """Close the pooled connections of the session."""
+        self.session.close()
 
     def analyse_full_text(self, text: str) -> dict:
         """Send a request to analyze full text sentiment."""
-        logger.info("Sending request to analyze full text.")
+        logger.debug("Sending request to analyze full text.")
         params = {"type": "full"}
         json = {"text": text}
-        response = requests.post(f"{self.url}/analyse", params=params, json=json)
+        response = self.session.post(f"{self.url}/analyse", params=params, json=json, timeout=self.timeout)
         if response.status_code == 200:
-            logger.info("Full text analysis completed successfully.")
+            logger.debug("Full text analysis completed successfully.")
             return response.json()
         else:
-            logger.error(f"Error: {response.status_code} - {response.text}")
+            logger.error("Error: %s - %s", response.status_code, response.text)
             return {"error": "Failed to analyze text."}
 
-    def analyse_text_per_sentence(self, text: str) -> dict:
-        """Send a request to analyze text sentiment per sentence."""
-        logger.info("Sending request to analyze text per sentence.")
-        params = {"type": "sentence"}
+    def analyse_text_per_sentence(self, text: str, include_sentences: bool = False) -> dict:
+        """Send a request to analyze text sentiment per sentence.
+
+        With include_sentences the response also lists the text, polarity and subjectivity
+        of every sentence under "sentences".
+        """
+        logger.debug("Sending request to analyze text per sentence.")
+        params = {"type": "sentence", "sentences": include_sentences}
         json = {"text": text}
-        response = requests.post(f"{self.url}/analyse", params=params, json=json)
+        response = self.session.post(f"{self.url}/analyse", params=params, json=json, timeout=self.timeout)
         if response.status_code == 200:
-            logger.info("Per sentence text analysis completed successfully.")
+            logger.debug("Per sentence text analysis completed successfully.")
             return response.json()
         else:
-            logger.error(f"Error: {response.status_code} - {response.text}")
+            logger.error("Error: %s - %s", response.status_code, response.text)
             return {"error": "Failed to analyze text."}
     
-    def analyse_full_text_bulk(self, df) -> pd.DataFrame:
+    def _post_bulk_batch(self, texts: list) -> "pd.DataFrame":
+        """Send one batch of texts to the bulk endpoint.
+
+        With pyarrow installed the batch goes out as an Arrow IPC stream and the API
+        answers with numeric result columns only, which are read into the DataFrame
+        without per-row conversion. Otherwise, or if the API cannot handle Arrow,
+        JSON is used.
+
+        Returns:
+            DataFrame: text, polarity, subjectivity and confidence of each text.
+
+        Raises:
+            requests.RequestException: if the request fails or the API answers with an error.
+        """
+        if self.use_arrow:
+            import pyarrow as pa
+
+            table = pa.table({"text": pa.array(texts, type=pa.string())})
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            headers = {"Content-Type": ARROW_STREAM, "Accept": f"{ARROW_STREAM}, application/json"}
+            response = self.session.post(f"{self.url}/analyse/bulk", data=sink.getvalue().to_pybytes(),
+                                         headers=headers, timeout=self.timeout)
+            if response.status_code == 415:
+                logger.warning("API does not support Arrow, falling back to JSON.")
+                self.use_arrow = False
+            else:
+                response.raise_for_status()
+                if response.headers.get("content-type", "").startswith(ARROW_STREAM):
+                    result_df = pa.ipc.open_stream(response.content).read_all().to_pandas(
+                        split_blocks=True, self_destruct=True)
+                    result_df.insert(0, "text", texts)
+                    return result_df
+                return self._items_to_frame(response.json())
+        response = self.session.post(f"{self.url}/analyse/bulk", json={"texts": texts}, timeout=self.timeout)
+        response.raise_for_status()
+        return self._items_to_frame(response.json())
+
+    @staticmethod
+    def _items_to_frame(items: list) -> "pd.DataFrame":
+        """Build the result DataFrame of a JSON bulk response."""
+        import pandas as pd
+
+        return pd.DataFrame([
+            {
+                "text": item["text"],
+                "polarity": item["result"]["polarity"],
+                "subjectivity": item["result"]["subjectivity"],
+                "confidence": item["confidence"]
+            }
+            for item in items
+        ], columns=["text", "polarity", "subjectivity", "confidence"])
+
+    def analyse_full_text_bulk(self, df, progress_callback=None) -> "pd.DataFrame":
         """Send a request to analyze full text sentiment for a DataFrame.
 
+        Large DataFrames are split into batches of at most batch_size texts, which are
+        sent concurrently and reassembled in their original order.
+
         Args:
             df (DataFrame): DataFrame containing a single column with text to be analyzed.
+            progress_callback (callable, optional): called as progress_callback(done, total) with
+                the number of analysed texts whenever a batch completes. Defaults to None.
 
         Returns:
             DataFrame: a DataFrame with the results of the sentiment analysis.
         """
+        import pandas as pd
+
         logger.info("Sending request to analyze the whole DataFrame")
-        texts = df.iloc[:, 0].tolist()
-        logger.debug(f"Texts to analyze: {texts}")
-        json = {"texts": texts}
-        response = requests.post(f"{self.url}/analyse/bulk", json=json)
-        if response.status_code == 200:
-            logger.info("Full text analysis completed successfully. response: %s", response.json())
-            analyzed_df = pd.DataFrame([
-                {
+        texts = df.iloc[:, 0].astype(str).tolist()
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        logger.debug("Texts to analyze: %d in %d batches", len(texts), len(batches))
+        results = [None] * len(batches)
+        done = 0
+        try:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, max(1, len(batches)))) as executor:
+                futures = {executor.submit(self._post_bulk_batch, batch): i for i, batch in enumerate(batches)}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    results[i] = future.result()
+                    done += len(batches[i])
+                    if progress_callback is not None:
+                        progress_callback(done, len(texts))
+        except requests.RequestException as e:
+            logger.error("Error: %s", e)
+            logger.error("returning original DataFrame")
+            return df
+        logger.info("Full text analysis of %d texts in %d batches completed successfully.", len(texts), len(batches))
+        if not results:
+            return self._items_to_frame([])
+        return pd.concat(results, ignore_index=True)
+
+    def iter_csv_bulk(self, file, progress_callback=None):
+        """Read a ";"-delimited one-column CSV in chunks and yield the results of each chunk.
+
+        The file is read batch_size rows at a time and every chunk is sent as one bulk
+        request, with at most max_concurrency chunks read ahead and in flight, so memory
+        is bounded by a few chunks instead of the whole file.
+
+        Args:
+            file (str or file-like): path or open binary file of the CSV, without header.
+            progress_callback (callable, optional): called as progress_callback(done, total) with
+                the bytes of the file read whenever a chunk completes. Defaults to None.
+
+        Yields:
+            DataFrame: the results of the sentiment analysis of one chunk, in file order.
+
+        Raises:
+            ValueError: if the CSV does not have exactly one column.
+            requests.RequestException: if a request fails or the API answers with an error.
+        """
+        import pandas as pd
+
+        if isinstance(file, str):
+            with open(file, "rb") as f:
+                yield from self.iter_csv_bulk(f, progress_callback=progress_callback)
+            return
+        total = getattr(file, "size", None)
+        if total is None:
+            start = file.tell()
+            total = file.seek(0, os.SEEK_END)
+            file.seek(start)
+        reader = pd.read_csv(file, header=None, delimiter=";", chunksize=self.batch_size)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for chunk in reader:
+                if chunk.shape[1] != 1:
+                    raise ValueError("CSV must have exactly one column containing text.")
+                position = file.tell()
+                pending.append((executor.submit(self._post_bulk_batch, chunk.iloc[:, 0].astype(str).tolist()),
+                                position))
+                if len(pending) >= self.max_concurrency:
+                    yield self._complete_chunk(pending.popleft(), total, progress_callback)
+            while pending:
+                yield self._complete_chunk(pending.popleft(), total, progress_callback)
+
+    @staticmethod
+    def _complete_chunk(pending_chunk, total, progress_callback) -> "pd.DataFrame":
+        """Wait for the bulk request of a chunk and report the bytes read up to that chunk."""
+        future, position = pending_chunk
+        result_df = future.result()
+        if progress_callback is not None and total:
+            progress_callback(min(position, total), total)
+        return result_df
+
+    def analyse_csv_bulk(self, file, progress_callback=None) -> "pd.DataFrame":
+        """Analyze a large CSV file chunk by chunk, see iter_csv_bulk.
+
+        Args:
+            file (str or file-like): path or open binary file of the CSV, without header.
+            progress_callback (callable, optional): called as progress_callback(done, total) with
+                the bytes of the file read whenever a chunk completes. Defaults to None.
+
+        Returns:
+            DataFrame: a DataFrame with the results of the sentiment analysis, None if a request failed.
+
+        Raises:
+            ValueError: if the CSV does not have exactly one column.
+        """
+        import pandas as pd
+
+        logger.info("Analysing CSV file in chunks of %d texts.", self.batch_size)
+        try:
+            chunks = list(self.iter_csv_bulk(file, progress_callback=progress_callback))
+        except requests.RequestException as e:
+            logger.error("Error: %s", e)
+            return None
+        logger.info("Chunked analysis of %d chunks completed successfully.", len(chunks))
+        if not chunks:
+            return self._items_to_frame([])
+        return pd.concat(chunks, ignore_index=True)
+
+    def summarise_csv_bulk(self, file, bins: int = 20) -> dict:
+        """Stream a ";"-delimited one-column CSV to the API and fetch only the distribution of its results.
+
+        The file is uploaded as it is read and the API answers with one summary instead
+        of a row per text: counts, mean, variance, quantiles and histogram of polarity,
+        subjectivity and confidence and the counts per SentimentCategorizer category.
+
+        Args:
+            file (str or file-like): path or open binary file of the CSV, without header.
+            bins (int, optional): histogram bins per score, a divisor of 2000. Defaults to 20.
+
+        Returns:
+            dict: the summary as returned by the API, None if the request failed.
+        """
+        if isinstance(file, str):
+            with open(file, "rb") as f:
+                return self.summarise_csv_bulk(f, bins=bins)
+        logger.info("Requesting the summary of a CSV file.")
+        try:
+            response = self.session.post(f"{self.url}/analyse/bulk/summary", data=file, params={"bins": bins},
+                                         headers={"Content-Type": "text/csv"}, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error("Error: %s", e)
+            return None
+        return response.json()
+
+    def submit_bulk_job(self, df):
+        """Submit the texts of a DataFrame as a background bulk job.
+
+        Args:
+            df (DataFrame): DataFrame containing a single column with text to be analyzed.
+
+        Returns:
+            str: id of the job, None if the submission failed.
+        """
+        texts = df.iloc[:, 0].astype(str).tolist()
+        logger.info("Submitting bulk job with %d texts.", len(texts))
+        try:
+            response = self.session.post(f"{self.url}/jobs/bulk", json={"texts": texts}, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error("Error: %s", e)
+            return None
+        return response.json()["job_id"]
+
+    def get_bulk_job(self, job_id: str, offset: int = 0, limit: int = 1000):
+        """Fetch the status of a bulk job and a page of its results.
+
+        Args:
+            job_id (str): id of the job.
+            offset (int, optional): index of the first result. Defaults to 0.
+            limit (int, optional): maximum number of results. Defaults to 1000.
+
+        Returns:
+            dict: the job status as returned by the API, None if the request failed.
+        """
+        try:
+            response = self.session.get(f"{self.url}/jobs/{job_id}", params={"offset": offset, "limit": limit},
+                                        timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            logger.error("Error: %s", e)
+            return None
+        return response.json()
+
+    def analyse_full_text_bulk_job(self, df, job_id=None, progress_callback=None, poll_interval: float = 1.0,
+                                   page_size: int = 5000) -> "pd.DataFrame":
+        """Analyze a DataFrame through a background job, polling until it is done.
+
+        Args:
+            df (DataFrame): DataFrame containing a single column with text to be analyzed.
+            job_id (str, optional): id of an already submitted job for df, a new job is submitted if None.
+            progress_callback (callable, optional): called as progress_callback(done, total) on every poll.
+            poll_interval (float, optional): seconds between two status polls. Defaults to 1.0.
+            page_size (int, optional): number of results fetched per request. Defaults to 5000.
+
+        Returns:
+            DataFrame: a DataFrame with the results of the sentiment analysis.
+        """
+        import pandas as pd
+
+        if job_id is None:
+            job_id = self.submit_bulk_job(df)
+        if job_id is None:
+            logger.error("returning original DataFrame")
+            return df
+        while True:
+            job = self.get_bulk_job(job_id, limit=0)
+            if job is None or job["status"] == "failed":
+                logger.error("Bulk job %s failed: %s", job_id, job and job["error"])
+                logger.error("returning original DataFrame")
+                return df
+            if progress_callback is not None:
+                progress_callback(job["done"], job["total"])
+            if job["status"] == "done":
+                break
+            time.sleep(poll_interval)
+
+        pages = []
+        for offset in range(0, job["total"], page_size):
+            page = self.get_bulk_job(job_id, offset=offset, limit=page_size)
+            if page is None:
+                logger.error("returning original DataFrame")
+                return df
+            pages.append(pd.DataFrame(page["results"], columns=["index", "polarity", "subjectivity", "confidence"]))
+        logger.info("Bulk job %s completed successfully.", job_id)
+        analyzed_df = pd.concat(pages, ignore_index=True) if pages else pd.DataFrame(
+            columns=["index", "polarity", "subjectivity", "confidence"])
+        analyzed_df = analyzed_df.drop(columns="index")
+        analyzed_df.insert(0, "text", df.iloc[:, 0].astype(str).tolist())
+        return analyzed_df
+
+    @contextmanager
+    def _duplex_post(self, path: str, chunks, content_type: str):
+        """POST a body of byte chunks and read the response while the body is still being sent.
+
+        requests sends the whole body before it reads any of the response. Against an
+        endpoint that answers while it reads, like /analyse/bulk/stream, both sides stop
+        once the socket buffers are full. Here a thread sends the body with chunked
+        transfer encoding while the caller reads the response. The connection is not
+        pooled and not retried.
+
+        Args:
+            path (str): endpoint path, appended to the base URL.
+            chunks (iterable): the body as bytes chunks.
+            content_type (str): content type of the body.
+
+        Yields:
+            HTTPResponse: the response with status and headers read, the body still streaming.
+
+        Raises:
+            requests.ConnectionError: if connecting, sending or reading fails.
+        """
+        parts = urlsplit(self.url)
+        connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(parts.hostname, parts.port, timeout=self.timeout)
+        upload_errors = []
+
+        def upload():
+            try:
+                buffer = []
+                size = 0
+                for chunk in chunks:
+                    buffer.append(chunk)
+                    size += len(chunk)
+                    if size >= 65536:
+                        connection.send(b"%x\r\n%b\r\n" % (size, b"".join(buffer)))
+                        buffer = []
+                        size = 0
+                if size:
+                    connection.send(b"%x\r\n%b\r\n" % (size, b"".join(buffer)))
+                connection.send(b"0\r\n\r\n")
+            except OSError as e:
+                upload_errors.append(e)
+
+        uploader = None
+        try:
+            connection.putrequest("POST", parts.path.rstrip("/") + path)
+            connection.putheader("Content-Type", content_type)
+            connection.putheader("Transfer-Encoding", "chunked")
+            connection.endheaders()
+            uploader = threading.Thread(target=upload, name="bulk-stream-upload", daemon=True)
+            uploader.start()
+            response = http.client.HTTPResponse(connection.sock, method="POST")
+            response.begin()
+            yield response
+        except (OSError, http.client.HTTPException) as e:
+            raise requests.ConnectionError(f"Streaming request to {path} failed: {e}") from e
+        finally:
+            # closing the socket also ends an upload the server stopped reading
+            connection.close()
+            if uploader is not None:
+                uploader.join()
+            if upload_errors:
+                logger.warning("Upload to %s stopped: %s", path, upload_errors[0])
+
+    def iter_full_text_bulk_stream(self, df, chunk_size: int = 1000):
+        """Stream the texts of a DataFrame to the API and yield the results in chunks.
+
+        The texts are sent as NDJSON while they are read and the NDJSON response is
+        consumed line by line at the same time, so neither side holds the whole batch as
+        one payload and neither waits for the other, see _duplex_post.
+
+        Args:
+            df (DataFrame): DataFrame containing a single column with text to be analyzed.
+            chunk_size (int, optional): number of result rows per yielded DataFrame. Defaults to 1000.
+
+        Yields:
+            DataFrame: the results of the sentiment analysis for up to chunk_size texts.
+
+        Raises:
+            requests.RequestException: if the connection fails or the API answered fewer
+                or more lines than texts were sent.
+        """
+        import pandas as pd
+
+        texts = df.iloc[:, 0].astype(str)
+        logger.info("Streaming %d texts to the bulk analysis endpoint.", len(texts))
+        body = (json.dumps(text).encode("utf-8") + b"\n" for text in texts)
+        received = 0
+        with self._duplex_post("/analyse/bulk/stream", body, "application/x-ndjson") as response:
+            if response.status != 200:
+                logger.error("Error: %s - %s", response.status, response.read().decode("utf-8", "replace"))
+                return
+            rows = []
+            skipped = 0
+            for line in response:
+                if not line.strip():
+                    continue
+                received += 1
+                item = json.loads(line)
+                if "error" in item:
+                    if not skipped:
+                        logger.warning("Skipped line: %s", item["error"])
+                    skipped += 1
+                    continue
+                rows.append({
                     "text": item["text"],
                     "polarity": item["result"]["polarity"],
                     "subjectivity": item["result"]["subjectivity"],
                     "confidence": item["confidence"]
-                }
-                for item in response.json()
-            ])
-            return analyzed_df
-        else:
-            logger.error(f"Error: {response.status_code} - {response.text}")
+                })
+                if len(rows) >= chunk_size:
+                    yield pd.DataFrame(rows)
+                    rows = []
+            if rows:
+                yield pd.DataFrame(rows)
+            if skipped:
+                logger.warning("Skipped %d malformed lines in total.", skipped)
+        # the API answers one line per text, fewer lines mean the stream was cut short
+        if received != len(texts):
+            logger.error("Received %d result lines for %d texts.", received, len(texts))
+            raise requests.RequestException(f"The stream answered {received} lines for {len(texts)} texts.")
+
+    def analyse_full_text_bulk_stream(self, df, chunk_size: int = 1000) -> "pd.DataFrame":
+        """Analyze a DataFrame through the streaming bulk endpoint.
+
+        Args:
+            df (DataFrame): DataFrame containing a single column with text to be analyzed.
+            chunk_size (int, optional): number of result rows collected per chunk. Defaults to 1000.
+
+        Returns:
+            DataFrame: a DataFrame with the results of the sentiment analysis.
+
+        Raises:
+            requests.RequestException: if the connection fails or not every text was answered.
+        """
+        import pandas as pd
+
+        chunks = list(self.iter_full_text_bulk_stream(df, chunk_size=chunk_size))
+        if not chunks:
             logger.error("returning original DataFrame")
             return df
+        logger.info("Streamed full text analysis completed successfully.")
+        return pd.concat(chunks, ignore_index=True)
 
 class SentimentCategorizer():
     """A class to categorize sentiment based on polarity."""
+
+    # (threshold, label) tables, highest threshold first, shared with the bulk summaries
+    # of the API: a score gets the label of the first threshold it exceeds, or the
+    # default label if it exceeds none.
+    POLARITY_CATEGORIES = categories.POLARITY_CATEGORIES
+    POLARITY_DEFAULT = categories.POLARITY_DEFAULT
+    SUBJECTIVITY_CATEGORIES = categories.SUBJECTIVITY_CATEGORIES
+    SUBJECTIVITY_DEFAULT = categories.SUBJECTIVITY_DEFAULT
+    CONFIDENCE_CATEGORIES = categories.CONFIDENCE_CATEGORIES
+    CONFIDENCE_DEFAULT = categories.CONFIDENCE_DEFAULT
     
     @staticmethod
     def categorize_polarity(polarity: float,) -> str:
@@ -81,20 +562,11 @@ class SentimentCategorizer():
             
         Returns:
             str: A string categorizing the sentiment."""
-        logger.info("categoring polarity: %s", polarity)
-        pol_categories = [
-            (0.9, "overwhelmingly positive"),
-            (0.5, "very positive"),
-            (0.1, "positive"),
-            (-0.1, "neutral"),
-            (-0.5, "negative"),
-            (-0.9, "very negative"),      
-        ]
-        for threshold, label in pol_categories:
+        logger.debug("categorizing polarity: %s", polarity)
+        for threshold, label in SentimentCategorizer.POLARITY_CATEGORIES:
             if polarity > threshold:
                 return label
-        logger.info("polarity successfully categorized.")
-        return "overwhelmingly negative"
+        return SentimentCategorizer.POLARITY_DEFAULT
                  
     @staticmethod
     def categorize_subjectivity(subjectivity: float) -> str:
@@ -105,18 +577,11 @@ class SentimentCategorizer():
             
         Returns:
             str: A string categorizing the subjectivity."""
-        logger.info("categorizing subjectivity: %s", subjectivity)
-        sub_categories = [
-            (0.9, "completely subjective"),
-            (0.5, "mostly subjective"),
-            (0.1, "slightly subjective"),
-            (0.0, "objective")
-        ]
-        for threshold, label in sub_categories:
+        logger.debug("categorizing subjectivity: %s", subjectivity)
+        for threshold, label in SentimentCategorizer.SUBJECTIVITY_CATEGORIES:
             if subjectivity > threshold:
                 return label
-        logger.info("subjectivity successfully categorized.")
-        return "completely objective"
+        return SentimentCategorizer.SUBJECTIVITY_DEFAULT
     
     @staticmethod
     def categorize_confidence(confidence: float,) -> str:
@@ -127,20 +592,71 @@ class SentimentCategorizer():
             
         Returns:
             str: A string categorizing the sentiment."""
-        logger.info("categorizing confidence: %s", confidence)
-        pol_categories = [
-            #arbitary numbers, just a guess for now
-            (0.9, "overwhelmingly confident"),
-            (0.6, "very confident"),
-            (0.3, "confident"),
-            (0.2, "not very confident"),
-            (0.1, "not confident")
-        ]
-        for threshold, label in pol_categories:
+        logger.debug("categorizing confidence: %s", confidence)
+        for threshold, label in SentimentCategorizer.CONFIDENCE_CATEGORIES:
             if confidence > threshold:
                 return label
-        logger.info("confidence successfully categorized.")
-        return "not confident at all"
+        return SentimentCategorizer.CONFIDENCE_DEFAULT
+
+    @staticmethod
+    def _categorize_batch(values, categories: list, default: str) -> "pd.Series":
+        """Categorize a whole column of scores against a threshold table in one call.
+
+        Uses the same strict "greater than" boundaries as the scalar methods; missing
+        values exceed no threshold and get the default label, like NaN does there.
+
+        Args:
+            values (Series): the scores to categorize.
+            categories (list): (threshold, label) table, highest threshold first.
+            default (str): label of scores that exceed no threshold.
+
+        Returns:
+            Series: an ordered categorical Series of labels, aligned with values.
+        """
+        import pandas as pd
+
+        values = pd.Series(values)
+        scores = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+        codes = category_codes(scores, categories)
+        labels = category_labels(categories, default)
+        logger.debug("Categorized %d scores.", len(codes))
+        return pd.Series(pd.Categorical.from_codes(codes, categories=labels, ordered=True), index=values.index)
+
+    @staticmethod
+    def categorize_polarity_batch(polarities) -> "pd.Series":
+        """Categorize a column of polarity scores, see categorize_polarity.
+
+        Args:
+            polarities (Series): The polarity scores of the texts.
+
+        Returns:
+            Series: categorical Series of polarity labels."""
+        return SentimentCategorizer._categorize_batch(
+            polarities, SentimentCategorizer.POLARITY_CATEGORIES, SentimentCategorizer.POLARITY_DEFAULT)
+
+    @staticmethod
+    def categorize_subjectivity_batch(subjectivities) -> "pd.Series":
+        """Categorize a column of subjectivity scores, see categorize_subjectivity.
+
+        Args:
+            subjectivities (Series): The subjectivity scores of the texts.
+
+        Returns:
+            Series: categorical Series of subjectivity labels."""
+        return SentimentCategorizer._categorize_batch(
+            subjectivities, SentimentCategorizer.SUBJECTIVITY_CATEGORIES, SentimentCategorizer.SUBJECTIVITY_DEFAULT)
+
+    @staticmethod
+    def categorize_confidence_batch(confidences) -> "pd.Series":
+        """Categorize a column of confidence scores, see categorize_confidence.
+
+        Args:
+            confidences (Series): The confidence scores of the texts.
+
+        Returns:
+            Series: categorical Series of confidence labels."""
+        return SentimentCategorizer._categorize_batch(
+            confidences, SentimentCategorizer.CONFIDENCE_CATEGORIES, SentimentCategorizer.CONFIDENCE_DEFAULT)
 
 if __name__ == "__main__":
     # testing the functions